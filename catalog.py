@@ -0,0 +1,140 @@
+# catalog.py
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+import models
+
+# Wie oft (in Sekunden) die Katalog-Version in der Datenbank nachgeschlagen wird.
+# Dazwischen gilt die zuletzt gelesene Version, damit nicht jede Anfrage eine
+# zusätzliche Abfrage auslöst.
+VERSION_CHECK_INTERVAL_SECONDS = 60
+
+# Maximale Anzahl einzeln gecachter Einträge (z.B. Kartendetails) pro Namensraum;
+# darüber werden die am längsten nicht genutzten verworfen.
+ITEM_CACHE_SIZE = int(os.getenv("ITEM_CACHE_SIZE", "2000"))
+
+_lock = threading.Lock()
+_version = None
+_version_checked_at = 0.0
+_entries = {}
+# Schlüssel -> Lock, damit pro Eintrag nur ein Thread gleichzeitig neu aufbaut
+_build_locks = {}
+# Namensraum -> (Katalog-Version, OrderedDict Schlüssel -> Wert)
+_items = {}
+
+
+def get_catalog_version(db: Session) -> str:
+    """
+    Gibt die aktuelle Katalog-Version zurück. Sie wird von `ingest_data.py`
+    nach jedem Import neu gesetzt und dient als Schlüssel für alle Caches.
+    """
+    global _version, _version_checked_at
+    now = time.monotonic()
+    with _lock:
+        if _version is not None and now - _version_checked_at < VERSION_CHECK_INTERVAL_SECONDS:
+            return _version
+
+    version = db.query(models.CatalogInfo.version).filter(models.CatalogInfo.id == 1).scalar()
+
+    with _lock:
+        _version = version or "0"
+        _version_checked_at = now
+        return _version
+
+
+def cached(db: Session, key: str, loader):
+    """
+    Liefert den Wert für `key` aus dem Prozess-Cache. Ist der Eintrag nicht
+    vorhanden oder stammt er aus einer älteren Katalog-Version, wird er mit
+    `loader(db)` neu berechnet; pro Schlüssel läuft dabei höchstens ein Loader
+    gleichzeitig. Der Loader muss reine Python-Daten liefern (keine an die
+    Session gebundenen ORM-Objekte).
+    """
+    version = get_catalog_version(db)
+    entry = _entries.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    with _lock:
+        build_lock = _build_locks.setdefault(key, threading.Lock())
+    # Nach einem Import verpassen viele gleichzeitige Anfragen den Cache; nur die
+    # erste baut neu auf, die übrigen warten auf ihr Ergebnis
+    with build_lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        value = loader(db)
+        with _lock:
+            _entries[key] = (version, value)
+    return value
+
+
+def _store_item(namespace: str, version: str, key, value):
+    # Muss unter _lock aufgerufen werden
+    entry = _items.get(namespace)
+    if entry is None or entry[0] != version:
+        entry = _items[namespace] = (version, OrderedDict())
+    entry[1][key] = value
+    entry[1].move_to_end(key)
+    while len(entry[1]) > ITEM_CACHE_SIZE:
+        entry[1].popitem(last=False)
+
+
+def cached_item(db: Session, namespace: str, key, loader):
+    """
+    Wie `cached`, aber für viele Einzelwerte eines Namensraums (z.B. eine Karte
+    pro TCG-ID) mit begrenzter Größe. `loader(db, key)` wird bei einem Fehltreffer
+    aufgerufen; liefert er None, wird nichts gecacht.
+    """
+    version = get_catalog_version(db)
+    with _lock:
+        entry = _items.get(namespace)
+        if entry is not None and entry[0] == version and key in entry[1]:
+            entry[1].move_to_end(key)
+            return entry[1][key]
+
+    value = loader(db, key)
+    if value is not None:
+        with _lock:
+            _store_item(namespace, version, key, value)
+    return value
+
+
+def prime_items(db: Session, namespace: str, values: dict):
+    """Legt bereits geladene Einzelwerte in den Cache (für die Aufwärmphase)."""
+    version = get_catalog_version(db)
+    with _lock:
+        for key, value in values.items():
+            _store_item(namespace, version, key, value)
+
+
+def invalidate():
+    """Leert alle Caches und erzwingt ein erneutes Lesen der Katalog-Version."""
+    global _version, _version_checked_at
+    with _lock:
+        _entries.clear()
+        _items.clear()
+        _version = None
+        _version_checked_at = 0.0
+
+
+def bump_catalog_version(session: Session) -> str:
+    """
+    Setzt eine neue Katalog-Version. Wird am Ende eines Imports aufgerufen,
+    damit laufende API-Prozesse ihre Caches verwerfen.
+    """
+    version = uuid.uuid4().hex
+    info = session.get(models.CatalogInfo, 1)
+    if info is None:
+        session.add(models.CatalogInfo(id=1, version=version, updated_at=datetime.utcnow()))
+    else:
+        info.version = version
+        info.updated_at = datetime.utcnow()
+    session.commit()
+    return version
@@ -1,4 +1,7 @@
 # database.py
+import itertools
+import os
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -11,9 +14,35 @@ POSTGRES_DB = "pokemon_api"
 
 SQLALCHEMY_DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
+# Optionale Lese-Replikate für die Katalog-Routen, kommagetrennt, z.B.
+# REPLICA_DATABASE_URLS=postgresql://postgres:pw@replica1/pokemon_api,postgresql://postgres:pw@replica2/pokemon_api
+# Ohne Angabe lesen auch die Katalog-Routen von der Primärdatenbank.
+REPLICA_DATABASE_URLS = [url.strip() for url in os.getenv("REPLICA_DATABASE_URLS", "").split(",") if url.strip()]
+
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+replica_engines = [create_engine(url) for url in REPLICA_DATABASE_URLS]
+_read_sessionmakers = [sessionmaker(autocommit=False, autoflush=False, bind=replica) for replica in replica_engines] or [SessionLocal]
+_read_counter = itertools.count()
+
+
+def configure_engines(primary, replicas=None):
+    """
+    Bindet alle Sessions an andere Engines (z.B. für die perf-Werkzeuge).
+    Ohne `replicas` laufen auch die lesenden Sessions gegen `primary`.
+    """
+    global _read_sessionmakers
+    SessionLocal.configure(bind=primary)
+    _read_sessionmakers = [sessionmaker(autocommit=False, autoflush=False, bind=replica)
+                           for replica in replicas or ()] or [SessionLocal]
+
+
+def ReadSessionLocal():
+    """Öffnet eine Session auf dem nächsten Lese-Replikat (reihum)."""
+    makers = _read_sessionmakers
+    return makers[next(_read_counter) % len(makers)]()
+
 # Eine Hilfsfunktion, die wir in unseren API-Endpunkten verwenden werden,
 # um eine Datenbank-Session zu bekommen.
 def get_db():
@@ -21,4 +50,14 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Für Routen, die nur den Katalog lesen. Sie dürfen auf ein Replikat gehen, weil
+# der Katalog nur durch den Import geändert wird; alles, was Benutzerdaten
+# schreibt oder direkt danach liest, bleibt bei get_db (Primärdatenbank).
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
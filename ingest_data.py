@@ -7,7 +7,10 @@ from tqdm import tqdm
 from datetime import datetime
 
 # Importiere die neuen, optimierten Pokémon-Modelle
-from models import Base, Set, Rarity, Type, Subtype, Artist, Card, Attack, Ability, Rule
+from models import Set, Rarity, Type, Subtype, Artist, Card, Attack, AttackCost, Ability, Rule, Evolution
+from catalog import bump_catalog_version
+from migrate import reset_database
+from parsing import parse_attack_cost, parse_damage, parse_collector_number, rarity_ranks
 
 # --- KONFIGURATION ---
 # Passen Sie diese Werte an Ihre Umgebung an.
@@ -31,8 +34,7 @@ def ingest_data():
     print("--- Starte Pokémon-Karten Ingestion ---")
 
     print("Setze Datenbank zurück und erstelle Tabellen...")
-    Base.metadata.drop_all(engine)
-    Base.metadata.create_all(engine)
+    reset_database(engine)
     print("Tabellen erfolgreich erstellt.")
 
     json_files = [os.path.join(root, file) for root, _, files in os.walk(DATA_ROOT_DIR) for file in files if file.endswith('.json')]
@@ -75,6 +77,7 @@ def ingest_data():
 
     print("\n[2/3] Befülle Lookup-Tabellen in der Datenbank...")
     set_map, rarity_map, type_map, subtype_map, artist_map = {}, {}, {}, {}, {}
+    set_release_date_map = {}
 
     for name in tqdm(sorted(list(all_sets - {None})), desc="Sets"):
         release_date_str = set_release_dates.get(name)
@@ -112,6 +115,7 @@ def ingest_data():
         session.add(obj)
         session.commit()
         set_map[name] = obj.id
+        set_release_date_map[name] = release_date_obj
 
     for model, names, name_map in [(Rarity, all_rarities, rarity_map), (Type, all_types, type_map), (Subtype, all_subtypes, subtype_map), (Artist, all_artists, artist_map)]:
         for name in tqdm(sorted(list(names - {None})), desc=model.__tablename__):
@@ -120,7 +124,16 @@ def ingest_data():
             session.commit()
             name_map[name] = obj.id
 
+    # Rang der Seltenheiten für die Sortierung nach Seltenheit (die IDs sind alphabetisch vergeben)
+    rarity_rank_map = rarity_ranks(all_rarities - {None})
+    for rarity in session.query(Rarity):
+        rarity.rank = rarity_rank_map[rarity.name]
+    session.commit()
+
     print("\n[3/3] Befülle Haupttabelle 'cards' und verknüpfe Beziehungen...")
+    # Kanten des Entwicklungsgraphen (Name -> Vorentwicklung), eindeutig über alle Karten
+    evolution_edges = set()
+
     for file_path in tqdm(json_files, desc="Importiere Karten"):
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
@@ -143,6 +156,7 @@ def ingest_data():
             set_data = data.get('set', {})
             set_id = set_map.get(set_data.get('name')) if isinstance(set_data, dict) else None
             rarity_id = rarity_map.get(set_data.get('rarity')) if isinstance(set_data, dict) else None
+            rarity_rank = rarity_rank_map.get(set_data.get('rarity')) if isinstance(set_data, dict) else None
             
             new_card = Card(
                 tcg_id=data['id'], 
@@ -151,12 +165,17 @@ def ingest_data():
                 supertype=data['supertype'],
                 hp=int(data['hp']) if data.get('hp') and str(data['hp']).isdigit() else None,
                 number_in_set=set_data.get('number') if isinstance(set_data, dict) else None,
-                evolves_from=data.get('evolvesFrom'), set_id=set_id, rarity_id=rarity_id,
+                collector_number=parse_collector_number(set_data.get('number')) if isinstance(set_data, dict) else None,
+                set_release_date=set_release_date_map.get(set_data.get('name')) if isinstance(set_data, dict) else None,
+                evolves_from=data.get('evolvesFrom'), set_id=set_id, rarity_id=rarity_id, rarity_rank=rarity_rank,
                 artist_id=artist_map.get(data.get('artist'))
             )
             
             session.add(new_card)
 
+            if data.get('evolvesFrom'):
+                evolution_edges.add((data['name'], data['evolvesFrom']))
+
             if data.get('types'):
                 types_to_add = session.query(Type).filter(Type.name.in_(data['types'])).all()
                 new_card.types.extend(types_to_add)
@@ -169,9 +188,13 @@ def ingest_data():
 
             if data.get('attacks'):
                 for attack_data in data['attacks']:
+                    converted_cost, energy_counts = parse_attack_cost(attack_data.get('cost'), attack_data.get('convertedEnergyCost'))
                     session.add(Attack(card_id=new_card.id, name=attack_data.get('name'),
                                        cost=", ".join(attack_data.get('cost', [])), damage=attack_data.get('damage'),
-                                       text=attack_data.get('text')))
+                                       text=attack_data.get('text'),
+                                       converted_cost=converted_cost, damage_value=parse_damage(attack_data.get('damage')),
+                                       cost_entries=[AttackCost(energy_type=energy, amount=amount)
+                                                     for energy, amount in energy_counts.items()]))
             
             if data.get('abilities'):
                 for ability_data in data['abilities']:
@@ -183,8 +206,13 @@ def ingest_data():
                     if rule_text:
                         session.add(Rule(card_id=new_card.id, text=rule_text))
     
+    print("Baue Entwicklungsgraphen auf...")
+    for name, evolves_from in sorted(evolution_edges):
+        session.add(Evolution(name=name, evolves_from=evolves_from))
+
     print("Alle Objekte erstellt. Führe finalen Commit aus...")
     session.commit()
+    bump_catalog_version(session)
     session.close()
     print("\n--- Daten-Ingestion erfolgreich abgeschlossen! ---")
 
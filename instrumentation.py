@@ -0,0 +1,275 @@
+# instrumentation.py
+"""
+Performance-Messung pro Anfrage.
+
+- `MetricsMiddleware` misst die Gesamtdauer jeder Anfrage und ordnet sie dem
+  Routen-Template zu (z.B. "/cards/{tcg_id}").
+- Über SQLAlchemy-Engine-Events werden Anzahl und Dauer der SQL-Anweisungen
+  der laufenden Anfrage gezählt (gilt für alle Engines des Prozesses).
+- `TimedRoute` markiert das Ende der Endpunkt-Funktion, sodass die Zeit für
+  Pydantic-Validierung und JSON-Kodierung getrennt ausgewiesen werden kann.
+
+Die Werte werden als `Server-Timing`-Header jeder Antwort mitgegeben und über
+`render_metrics()` im Prometheus-Textformat bereitgestellt. Die Metriken
+gelten pro Worker-Prozess.
+
+Im Entwicklungsmodus (`DETECT_REPEATED_QUERIES=1`) werden außerdem identische
+SQL-Anweisungen gemeldet, die innerhalb einer Anfrage mehrfach laufen - das
+typische Muster eines N+1-Problems durch Lazy-Loading.
+"""
+import contextvars
+import functools
+from collections import Counter
+import inspect
+import logging
+import os
+import threading
+import time
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("pokenizer.performance")
+
+# Abfragen, die länger als dieser Wert (in ms) laufen, werden samt Parametern
+# protokolliert. Leer bzw. nicht gesetzt = Slow-Query-Log deaktiviert.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0") or 0)
+
+# Entwicklungsmodus: meldet SQL-Anweisungen, die innerhalb einer Anfrage
+# mindestens REPEATED_QUERY_THRESHOLD-mal mit identischem Text ausgeführt werden.
+DETECT_REPEATED_QUERIES = os.getenv("DETECT_REPEATED_QUERIES", "").lower() in ("1", "true", "yes")
+REPEATED_QUERY_THRESHOLD = int(os.getenv("REPEATED_QUERY_THRESHOLD", "2"))
+
+# Obergrenzen der Latenz-Buckets in Sekunden
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestStats:
+    """Sammelt die Messwerte einer einzelnen Anfrage."""
+    __slots__ = ("sql_count", "sql_seconds", "endpoint_done_at", "sql_seconds_at_endpoint_done", "request_target",
+                 "statements")
+
+    def __init__(self, request_target: str = ""):
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.endpoint_done_at = None
+        self.sql_seconds_at_endpoint_done = 0.0
+        self.request_target = request_target
+        self.statements = Counter() if DETECT_REPEATED_QUERIES else None
+
+    def repeated_statements(self):
+        """Gibt die mehrfach ausgeführten Anweisungen als Liste (Anweisung, Anzahl) zurück."""
+        if self.statements is None:
+            return []
+        return [(statement, count) for statement, count in self.statements.most_common()
+                if count >= REPEATED_QUERY_THRESHOLD]
+
+
+_current_stats = contextvars.ContextVar("request_stats", default=None)
+
+
+# --- SQL-Messung über Engine-Events ---
+
+# Die Startzeit hängt am Ausführungskontext der einzelnen Anweisung und
+# verschwindet mit ihm - auch wenn die Anweisung mit einem Fehler abbricht.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = getattr(context, "_query_started_at", None)
+    if started_at is None:
+        return
+    elapsed = time.perf_counter() - started_at
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.sql_count += 1
+        stats.sql_seconds += elapsed
+        if stats.statements is not None:
+            stats.statements[statement] += 1
+    if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+        logger.warning(
+            "Langsame Abfrage (%.1f ms) in %s\n%s\nGebundene Parameter: %s",
+            elapsed * 1000, stats.request_target if stats is not None else "-", statement,
+            _loggable_parameters(statement, parameters)
+        )
+
+
+def _loggable_parameters(statement: str, parameters) -> str:
+    """
+    Gibt die Parameter lesender Abfragen (die Filterwerte) für das Log zurück.
+    Schreibende Anweisungen enthalten die gespeicherten Daten selbst, z.B.
+    E-Mail-Adresse und Passwort-Hash bei der Registrierung, und werden daher
+    nur ohne Werte protokolliert.
+    """
+    if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return repr(parameters)
+    return "(ausgeblendet, keine lesende Abfrage)"
+
+
+# --- Markierung des Endpunkt-Endes ---
+
+def _mark_endpoint_done():
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.endpoint_done_at = time.perf_counter()
+        stats.sql_seconds_at_endpoint_done = stats.sql_seconds
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute, die das Ende der Endpunkt-Funktion festhält. Alles danach bis zum
+    Absenden der Antwort ist Serialisierung (Validierung + JSON-Kodierung).
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def timed_endpoint(*args, **kw):
+                try:
+                    return await endpoint(*args, **kw)
+                finally:
+                    _mark_endpoint_done()
+        else:
+            @functools.wraps(endpoint)
+            def timed_endpoint(*args, **kw):
+                try:
+                    return endpoint(*args, **kw)
+                finally:
+                    _mark_endpoint_done()
+        super().__init__(path, timed_endpoint, **kwargs)
+
+
+# --- Aggregierte Metriken ---
+
+class _RouteMetrics:
+    __slots__ = ("bucket_counts", "count", "seconds", "sql_count", "sql_seconds", "serialize_seconds")
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.seconds = 0.0
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+
+_metrics_lock = threading.Lock()
+_route_metrics = {}
+
+
+def _record(method: str, route: str, total: float, stats: RequestStats, serialize: float):
+    with _metrics_lock:
+        metrics = _route_metrics.get((method, route))
+        if metrics is None:
+            metrics = _route_metrics[(method, route)] = _RouteMetrics()
+        for index, upper_bound in enumerate(LATENCY_BUCKETS):
+            if total <= upper_bound:
+                metrics.bucket_counts[index] += 1
+                break
+        metrics.count += 1
+        metrics.seconds += total
+        metrics.sql_count += stats.sql_count
+        metrics.sql_seconds += stats.sql_seconds
+        metrics.serialize_seconds += serialize
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_metrics() -> str:
+    """Gibt alle gesammelten Metriken im Prometheus-Textformat zurück."""
+    with _metrics_lock:
+        snapshot = sorted(_route_metrics.items())
+        lines = [
+            "# HELP pokenizer_request_duration_seconds Dauer der Anfragen pro Route.",
+            "# TYPE pokenizer_request_duration_seconds histogram"
+        ]
+        for (method, route), metrics in snapshot:
+            labels = f'method="{method}",route="{_escape_label(route)}"'
+            cumulative = 0
+            for upper_bound, bucket_count in zip(LATENCY_BUCKETS, metrics.bucket_counts):
+                cumulative += bucket_count
+                lines.append(f'pokenizer_request_duration_seconds_bucket{{{labels},le="{upper_bound}"}} {cumulative}')
+            lines.append(f'pokenizer_request_duration_seconds_bucket{{{labels},le="+Inf"}} {metrics.count}')
+            lines.append(f"pokenizer_request_duration_seconds_sum{{{labels}}} {metrics.seconds}")
+            lines.append(f"pokenizer_request_duration_seconds_count{{{labels}}} {metrics.count}")
+
+        for name, help_text, attribute in [
+            ("pokenizer_sql_statements_total", "Anzahl der SQL-Anweisungen pro Route.", "sql_count"),
+            ("pokenizer_sql_duration_seconds_total", "In SQL-Anweisungen verbrachte Zeit pro Route.", "sql_seconds"),
+            ("pokenizer_serialization_duration_seconds_total", "Zeit für Validierung und JSON-Kodierung pro Route.", "serialize_seconds")
+        ]:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (method, route), metrics in snapshot:
+                labels = f'method="{method}",route="{_escape_label(route)}"'
+                lines.append(f"{name}{{{labels}}} {getattr(metrics, attribute)}")
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics():
+    """Verwirft alle gesammelten Metriken."""
+    with _metrics_lock:
+        _route_metrics.clear()
+
+
+# --- ASGI-Middleware ---
+
+class MetricsMiddleware:
+    """Misst jede HTTP-Anfrage und ergänzt den `Server-Timing`-Header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        query_string = scope.get("query_string", b"").decode("latin-1")
+        stats = RequestStats(f"{scope['method']} {scope['path']}" + (f"?{query_string}" if query_string else ""))
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        timing = {}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                total = now - started
+                serialize = 0.0
+                if stats.endpoint_done_at is not None:
+                    # SQL durch Lazy-Loading während der Serialisierung zählt als Datenbankzeit
+                    serialize = max(0.0, now - stats.endpoint_done_at
+                                    - (stats.sql_seconds - stats.sql_seconds_at_endpoint_done))
+                timing["total"], timing["serialize"] = total, serialize
+                app_seconds = max(0.0, total - stats.sql_seconds - serialize)
+                header = (
+                    f'db;dur={stats.sql_seconds * 1000:.2f};desc="SQL ({stats.sql_count})", '
+                    f"app;dur={app_seconds * 1000:.2f}, "
+                    f"serialize;dur={serialize * 1000:.2f}, "
+                    f"total;dur={total * 1000:.2f}"
+                )
+                headers = list(message.get("headers", [])) + [(b"server-timing", header.encode("latin-1"))]
+                repeated = stats.repeated_statements()
+                if repeated:
+                    headers.append((b"x-repeated-queries", str(sum(count for _, count in repeated)).encode("latin-1")))
+                    for statement, count in repeated:
+                        logger.warning("Mögliches N+1-Problem in %s: Anweisung %d-mal ausgeführt\n%s",
+                                       stats.request_target, count, statement)
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            _record(scope["method"], route_path, timing.get("total", time.perf_counter() - started),
+                    stats, timing.get("serialize", 0.0))
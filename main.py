@@ -1,15 +1,29 @@
 # main.py
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
-from routers import cards, users, lists, sets, collection # Importiere unsere neuen Router
+import instrumentation, warmup
+from routers import cards, users, lists, sets, collection, artists, autocomplete, health # Importiere unsere neuen Router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Caches im Hintergrund aufwärmen; /health/ready meldet Bereitschaft erst danach
+    warmup.start()
+    yield
+    warmup.stop()
 
 app = FastAPI(
     title="Pokenizer API",
     description="Eine API zum Durchsuchen und Verwalten von Pokémon-Sammelkarten.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Misst jede Anfrage (Latenz, SQL, Serialisierung) für /metrics und den Server-Timing-Header
+app.add_middleware(instrumentation.MetricsMiddleware)
+
 # Definiere den Pfad zum Verzeichnis, in dem die Bilder liegen
 # ('data/kartendaten' relativ zur 'main.py')
 IMAGE_DIR_PATH = os.path.join(os.path.dirname(__file__), 'data', 'kartendaten')
@@ -23,10 +37,20 @@ app.include_router(users.router)
 app.include_router(sets.router)
 app.include_router(lists.router)
 app.include_router(collection.router)
+app.include_router(artists.router)
+app.include_router(autocomplete.router)
+app.include_router(health.router)
 
 @app.get("/", tags=["Root"])
 def read_root():
     """
     Ein einfacher Willkommens-Endpunkt.
     """
-    return {"message": "Willkommen bei der Pokenizer API! Gehen Sie zu /docs für die Dokumentation."}
\ No newline at end of file
+    return {"message": "Willkommen bei der Pokenizer API! Gehen Sie zu /docs für die Dokumentation."}
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Monitoring"])
+def read_metrics():
+    """
+    Gibt die Performance-Metriken dieses Worker-Prozesses im Prometheus-Format zurück.
+    """
+    return instrumentation.render_metrics()
\ No newline at end of file
@@ -0,0 +1,37 @@
+# migrate.py
+"""
+Hilfsfunktionen, um Alembic-Migrationen aus Python heraus auszuführen
+(ingest_data.py, perf-Werkzeuge). Von der Kommandozeile genügt `alembic upgrade head`.
+"""
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+
+from models import Base
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+
+def _config(connection) -> Config:
+    config = Config(ALEMBIC_INI)
+    # Verbindung an migrations/env.py durchreichen; das Logging der Anwendung bleibt unverändert
+    config.attributes["connection"] = connection
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def upgrade_database(engine, revision: str = "head"):
+    """Bringt das Schema der Datenbank auf den angegebenen Stand."""
+    with engine.connect() as connection:
+        command.upgrade(_config(connection), revision)
+        connection.commit()
+
+
+def reset_database(engine):
+    """Löscht alle Tabellen (inkl. Versionstabelle) und legt das Schema per Migration neu an."""
+    Base.metadata.drop_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    upgrade_database(engine)
@@ -0,0 +1,55 @@
+# migrations/env.py
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+
+import database
+from models import Base
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+# Die Migrationen beschreiben genau das Schema der Modelle (für `alembic check` / autogenerate)
+target_metadata = Base.metadata
+
+
+def get_url():
+    # Überschreibbar mit: alembic -x url=postgresql://... upgrade head
+    return context.get_x_argument(as_dictionary=True).get("url") or database.SQLALCHEMY_DATABASE_URL
+
+
+def run_migrations_offline():
+    """Erzeugt das SQL-Skript, ohne sich mit der Datenbank zu verbinden (`alembic upgrade head --sql`)."""
+    context.configure(url=get_url(), target_metadata=target_metadata, literal_binds=True,
+                      dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    # Eine Transaktion pro Migration, da 0002 Indizes außerhalb einer Transaktion (CONCURRENTLY) anlegt
+    # migrate.py übergibt eine bestehende Verbindung (z.B. aus ingest_data.py oder den perf-Werkzeugen)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata,
+                          transaction_per_migration=True)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_engine(get_url())
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata,
+                          transaction_per_migration=True)
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
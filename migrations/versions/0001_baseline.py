@@ -0,0 +1,160 @@
+"""Ausgangsschema
+
+Entspricht genau dem Schema, das `Base.metadata.create_all` in ingest_data.py
+vor der Einführung der Migrationen angelegt hat. Solche bestehenden
+Datenbanken werden mit `alembic stamp 0001` übernommen und danach mit
+`alembic upgrade head` aktualisiert.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 13:23:29.152086
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Legt alle Tabellen des Ausgangsschemas an."""
+    op.create_table('artists',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('rarities',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('sets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('release_date', sa.Date(), nullable=True),
+    sa.Column('symbol_url', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('subtypes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('types',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('cards',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tcg_id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('image_url', sa.String(), nullable=True),
+    sa.Column('supertype', sa.String(), nullable=False),
+    sa.Column('hp', sa.Integer(), nullable=True),
+    sa.Column('number_in_set', sa.String(), nullable=True),
+    sa.Column('evolves_from', sa.String(), nullable=True),
+    sa.Column('set_id', sa.Integer(), nullable=True),
+    sa.Column('rarity_id', sa.Integer(), nullable=True),
+    sa.Column('artist_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['artist_id'], ['artists.id'], ),
+    sa.ForeignKeyConstraint(['rarity_id'], ['rarities.id'], ),
+    sa.ForeignKeyConstraint(['set_id'], ['sets.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_cards_name'), 'cards', ['name'], unique=False)
+    op.create_index(op.f('ix_cards_tcg_id'), 'cards', ['tcg_id'], unique=True)
+    op.create_table('abilities',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('card_id', sa.Integer(), nullable=True),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('text', sa.Text(), nullable=True),
+    sa.Column('type', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['card_id'], ['cards.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('attacks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('card_id', sa.Integer(), nullable=True),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('cost', sa.Text(), nullable=True),
+    sa.Column('damage', sa.String(), nullable=True),
+    sa.Column('text', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['card_id'], ['cards.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('card_subtypes',
+    sa.Column('card_id', sa.Integer(), nullable=False),
+    sa.Column('subtype_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['card_id'], ['cards.id'], ),
+    sa.ForeignKeyConstraint(['subtype_id'], ['subtypes.id'], ),
+    sa.PrimaryKeyConstraint('card_id', 'subtype_id')
+    )
+    op.create_table('card_types',
+    sa.Column('card_id', sa.Integer(), nullable=False),
+    sa.Column('type_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['card_id'], ['cards.id'], ),
+    sa.ForeignKeyConstraint(['type_id'], ['types.id'], ),
+    sa.PrimaryKeyConstraint('card_id', 'type_id')
+    )
+    op.create_table('rules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('card_id', sa.Integer(), nullable=True),
+    sa.Column('text', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['card_id'], ['cards.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user_collections',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('card_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.CheckConstraint('quantity > 0', name='check_quantity_positive'),
+    sa.ForeignKeyConstraint(['card_id'], ['cards.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'card_id')
+    )
+
+
+def downgrade() -> None:
+    """Entfernt alle Tabellen."""
+    op.drop_table('user_collections')
+    op.drop_table('rules')
+    op.drop_table('card_types')
+    op.drop_table('card_subtypes')
+    op.drop_table('attacks')
+    op.drop_table('abilities')
+    op.drop_index(op.f('ix_cards_tcg_id'), table_name='cards')
+    op.drop_index(op.f('ix_cards_name'), table_name='cards')
+    op.drop_table('cards')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_table('types')
+    op.drop_table('subtypes')
+    op.drop_table('sets')
+    op.drop_table('rarities')
+    op.drop_table('artists')
@@ -0,0 +1,139 @@
+"""Katalog-Erweiterungen: Entwicklungsgraph, Katalog-Version, strukturierte Attacken, Sortierschlüssel
+
+Legt die Tabellen evolutions, catalog_info und attack_costs an, ergänzt
+cards.collector_number, cards.set_release_date, attacks.converted_cost und
+attacks.damage_value sowie die Sortier- und Filterindizes auf cards und attacks.
+
+Die neuen Spalten und Tabellen werden aus den vorhandenen Daten befüllt, ein
+erneuter Import ist nicht nötig:
+- collector_number aus number_in_set, set_release_date aus sets.release_date,
+- converted_cost, damage_value und attack_costs aus attacks.cost/damage
+  (die Energiekosten wurden beim Import als "Feuer, Farblos" gespeichert),
+- evolutions aus cards.evolves_from.
+
+Die Indizes auf den bestehenden Tabellen werden erst nach dem Befüllen und auf
+PostgreSQL mit CREATE INDEX CONCURRENTLY angelegt.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 13:25:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from parsing import parse_attack_cost, parse_collector_number, parse_damage
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Indizes auf bereits befüllten Tabellen: (Indexname, Tabelle, Spalten)
+INDEXES = [
+    ('ix_attacks_converted_cost', 'attacks', ['converted_cost']),
+    ('ix_attacks_damage_value', 'attacks', ['damage_value']),
+    ('ix_cards_artist_id', 'cards', ['artist_id']),
+    ('ix_cards_name_id', 'cards', ['name', 'id']),
+    ('ix_cards_hp_id', 'cards', ['hp', 'id']),
+    ('ix_cards_rarity_id_id', 'cards', ['rarity_id', 'id']),
+    ('ix_cards_release_order', 'cards', ['set_release_date', 'collector_number', 'id']),
+    ('ix_cards_set_collector_number', 'cards', ['set_id', 'collector_number', 'id']),
+]
+
+# Größe der Blöcke beim Befüllen der Attacken
+BATCH_SIZE = 5000
+
+
+def _backfill_cards(bind):
+    bind.execute(sa.text(
+        "UPDATE cards SET set_release_date = (SELECT sets.release_date FROM sets WHERE sets.id = cards.set_id)"
+    ))
+    numbers = bind.execute(sa.text("SELECT DISTINCT number_in_set FROM cards WHERE number_in_set IS NOT NULL")).scalars().all()
+    updates = [{"collector_number": parse_collector_number(number), "number_in_set": number} for number in numbers]
+    updates = [update for update in updates if update["collector_number"] is not None]
+    if updates:
+        bind.execute(sa.text("UPDATE cards SET collector_number = :collector_number WHERE number_in_set = :number_in_set"),
+                     updates)
+
+
+def _backfill_attacks(bind):
+    attacks = bind.execute(sa.text("SELECT id, cost, damage FROM attacks ORDER BY id")).all()
+    for start in range(0, len(attacks), BATCH_SIZE):
+        updates, costs = [], []
+        for attack_id, cost, damage in attacks[start:start + BATCH_SIZE]:
+            converted_cost, energy_counts = parse_attack_cost([energy.strip() for energy in (cost or "").split(",")])
+            updates.append({"id": attack_id, "converted_cost": converted_cost, "damage_value": parse_damage(damage)})
+            costs.extend({"attack_id": attack_id, "energy_type": energy, "amount": amount}
+                         for energy, amount in energy_counts.items())
+        bind.execute(sa.text("UPDATE attacks SET converted_cost = :converted_cost, damage_value = :damage_value WHERE id = :id"),
+                     updates)
+        if costs:
+            bind.execute(sa.text("INSERT INTO attack_costs (attack_id, energy_type, amount) VALUES (:attack_id, :energy_type, :amount)"),
+                         costs)
+
+
+def upgrade() -> None:
+    """Legt die neuen Tabellen und Spalten an, befüllt sie und erstellt danach die Indizes."""
+    op.create_table('catalog_info',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.String(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('evolutions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('evolves_from', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name', 'evolves_from', name='uq_evolution_edge')
+    )
+    op.create_index(op.f('ix_evolutions_evolves_from'), 'evolutions', ['evolves_from'], unique=False)
+    op.create_index(op.f('ix_evolutions_name'), 'evolutions', ['name'], unique=False)
+    op.create_table('attack_costs',
+    sa.Column('attack_id', sa.Integer(), nullable=False),
+    sa.Column('energy_type', sa.String(), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['attack_id'], ['attacks.id'], ),
+    sa.PrimaryKeyConstraint('attack_id', 'energy_type')
+    )
+    op.create_index('ix_attack_costs_energy_type_amount', 'attack_costs', ['energy_type', 'amount'], unique=False)
+    op.add_column('attacks', sa.Column('converted_cost', sa.Integer(), nullable=True))
+    op.add_column('attacks', sa.Column('damage_value', sa.Integer(), nullable=True))
+    op.add_column('cards', sa.Column('collector_number', sa.Integer(), nullable=True))
+    op.add_column('cards', sa.Column('set_release_date', sa.Date(), nullable=True))
+
+    bind = op.get_bind()
+    _backfill_cards(bind)
+    _backfill_attacks(bind)
+    bind.execute(sa.text(
+        "INSERT INTO evolutions (name, evolves_from) "
+        "SELECT DISTINCT name, evolves_from FROM cards WHERE evolves_from IS NOT NULL"
+    ))
+
+    # CONCURRENTLY ist innerhalb einer Transaktion nicht erlaubt
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True,
+                            postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Entfernt die Indizes, Spalten und Tabellen wieder."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+    op.drop_column('cards', 'set_release_date')
+    op.drop_column('cards', 'collector_number')
+    op.drop_column('attacks', 'damage_value')
+    op.drop_column('attacks', 'converted_cost')
+    op.drop_index('ix_attack_costs_energy_type_amount', table_name='attack_costs')
+    op.drop_table('attack_costs')
+    op.drop_index(op.f('ix_evolutions_name'), table_name='evolutions')
+    op.drop_index(op.f('ix_evolutions_evolves_from'), table_name='evolutions')
+    op.drop_table('evolutions')
+    op.drop_table('catalog_info')
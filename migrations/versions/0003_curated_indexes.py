@@ -0,0 +1,52 @@
+"""Kuratierte Indizes für Fremdschlüssel und Verbindungstabellen
+
+Ergänzt Indizes auf den Fremdschlüsseln, über die die Router Detaildaten
+nachladen (attacks/abilities/rules.card_id, user_collections.card_id), sowie
+auf der Gegenrichtung der Verbindungstabellen (alle Karten eines Typs bzw.
+Subtyps). cards.set_id, cards.rarity_id und cards.artist_id sind bereits durch
+die Indizes aus 0002 abgedeckt.
+
+Auf PostgreSQL werden die Indizes mit CREATE INDEX CONCURRENTLY angelegt,
+damit eine laufende Datenbank währenddessen nicht gesperrt wird.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (Indexname, Tabelle, Spalten)
+INDEXES = [
+    ('ix_attacks_card_id', 'attacks', ['card_id']),
+    ('ix_abilities_card_id', 'abilities', ['card_id']),
+    ('ix_rules_card_id', 'rules', ['card_id']),
+    ('ix_user_collections_card_id', 'user_collections', ['card_id']),
+    ('ix_card_types_type_id_card_id', 'card_types', ['type_id', 'card_id']),
+    ('ix_card_subtypes_subtype_id_card_id', 'card_subtypes', ['subtype_id', 'card_id']),
+]
+
+
+def upgrade() -> None:
+    """Legt die Indizes an (auf PostgreSQL ohne Schreibsperre)."""
+    # CONCURRENTLY ist innerhalb einer Transaktion nicht erlaubt
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True,
+                            postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Entfernt die Indizes wieder."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,54 @@
+"""Rang der Seltenheiten für die Sortierung nach Seltenheit
+
+Die IDs der Seltenheiten werden beim Import alphabetisch vergeben, daher
+sortierte `sort=rarity` bisher "Common, Promo, Rare, ..., Uncommon". Neu sind
+rarities.rank (Reihenfolge aus parsing.RARITY_ORDER) und die denormalisierte
+Spalte cards.rarity_rank mit dem Index (rarity_rank, id). Beide werden aus den
+vorhandenen Daten befüllt.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from parsing import rarity_ranks
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Legt die Spalten an, befüllt sie und erstellt danach den Sortierindex."""
+    op.add_column('rarities', sa.Column('rank', sa.Integer(), nullable=True))
+    op.add_column('cards', sa.Column('rarity_rank', sa.Integer(), nullable=True))
+
+    bind = op.get_bind()
+    names = bind.execute(sa.text("SELECT name FROM rarities")).scalars().all()
+    ranks = [{"name": name, "rank": rank} for name, rank in rarity_ranks(names).items()]
+    if ranks:
+        bind.execute(sa.text("UPDATE rarities SET rank = :rank WHERE name = :name"), ranks)
+    bind.execute(sa.text(
+        "UPDATE cards SET rarity_rank = (SELECT rarities.rank FROM rarities WHERE rarities.id = cards.rarity_id)"
+    ))
+
+    # CONCURRENTLY ist innerhalb einer Transaktion nicht erlaubt
+    with op.get_context().autocommit_block():
+        op.create_index('ix_cards_rarity_rank_id', 'cards', ['rarity_rank', 'id'], unique=False,
+                        if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Entfernt Index und Spalten wieder."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_cards_rarity_rank_id', table_name='cards', if_exists=True, postgresql_concurrently=True)
+    op.drop_column('cards', 'rarity_rank')
+    op.drop_column('rarities', 'rank')
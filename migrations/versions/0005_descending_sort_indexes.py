@@ -0,0 +1,51 @@
+"""Absteigende Sortierindizes mit NULLS LAST
+
+`sort=-hp`, `-release` und `-rarity` sortieren Karten ohne Wert (z.B. Trainer
+ohne HP) ans Ende. PostgreSQL kann dafür die aufsteigenden Indizes nicht
+rückwärts lesen (das ergäbe NULLS FIRST), daher bekommen diese Sortierungen
+eigene Indizes mit DESC NULLS LAST.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 15:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (Indexname, Spalten-Ausdrücke auf cards)
+INDEXES = [
+    ('ix_cards_hp_desc', ['hp DESC NULLS LAST', 'id DESC']),
+    ('ix_cards_release_order_desc', ['set_release_date DESC NULLS LAST', 'collector_number DESC NULLS LAST', 'id DESC']),
+    ('ix_cards_rarity_rank_desc', ['rarity_rank DESC NULLS LAST', 'id DESC']),
+]
+
+
+def upgrade() -> None:
+    """Legt die Indizes an (auf PostgreSQL ohne Schreibsperre)."""
+    # SQLite kennt NULLS LAST in Indizes nicht, sortiert NULL aber als kleinsten Wert;
+    # DESC stellt Karten ohne Wert dort also ohnehin ans Ende.
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+    # CONCURRENTLY ist innerhalb einer Transaktion nicht erlaubt
+    with op.get_context().autocommit_block():
+        for name, expressions in INDEXES:
+            if sqlite:
+                expressions = [expression.replace(' NULLS LAST', '') for expression in expressions]
+            op.create_index(name, 'cards', [sa.text(expression) for expression in expressions], unique=False,
+                            if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Entfernt die Indizes wieder."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='cards', if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,39 @@
+"""Entfernt den überflüssigen Index ix_cards_name
+
+ix_cards_name_id (name, id) aus 0002 deckt alle Abfragen auf cards.name ab
+(Gleichheit, IN-Listen der Entwicklungsreihen und die Sortierung nach Name).
+Der einspaltige Index aus dem Ausgangsschema wurde nur noch bei jedem
+Schreibzugriff auf cards mitgepflegt.
+
+Auf PostgreSQL wird der Index mit DROP INDEX CONCURRENTLY entfernt, damit
+eine laufende Datenbank währenddessen nicht gesperrt wird.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Entfernt den Index (auf PostgreSQL ohne Schreibsperre)."""
+    # CONCURRENTLY ist innerhalb einer Transaktion nicht erlaubt
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_cards_name', table_name='cards', if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Legt den Index wieder an."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_cards_name', 'cards', ['name'], unique=False, if_not_exists=True,
+                        postgresql_concurrently=True)
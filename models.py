@@ -1,22 +1,26 @@
 # models.py
 from sqlalchemy.orm import declarative_base, relationship
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Table, Date
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Table, Date, DateTime
 from sqlalchemy import Boolean
-from sqlalchemy import CheckConstraint
+from sqlalchemy import CheckConstraint, UniqueConstraint, Index
 
 # Die Base-Klasse, von der alle unsere Modelle erben.
 Base = declarative_base()
 
 # --- Verbindungstabellen für Viele-zu-Viele-Beziehungen ---
 
+# Der Primärschlüssel (card_id, ...) deckt die Suche nach den Typen einer Karte ab,
+# der zusätzliche Index die Gegenrichtung (alle Karten eines Typs).
 card_types_table = Table('card_types', Base.metadata,
     Column('card_id', Integer, ForeignKey('cards.id'), primary_key=True),
-    Column('type_id', Integer, ForeignKey('types.id'), primary_key=True)
+    Column('type_id', Integer, ForeignKey('types.id'), primary_key=True),
+    Index('ix_card_types_type_id_card_id', 'type_id', 'card_id')
 )
 
 card_subtypes_table = Table('card_subtypes', Base.metadata,
     Column('card_id', Integer, ForeignKey('cards.id'), primary_key=True),
-    Column('subtype_id', Integer, ForeignKey('subtypes.id'), primary_key=True)
+    Column('subtype_id', Integer, ForeignKey('subtypes.id'), primary_key=True),
+    Index('ix_card_subtypes_subtype_id_card_id', 'subtype_id', 'card_id')
 )
 
 # --- Lookup-Tabellen (für einzigartige Werte) ---
@@ -33,6 +37,7 @@ class Rarity(Base):
     __tablename__ = 'rarities'
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False, unique=True)
+    rank = Column(Integer, nullable=True) # Reihenfolge von häufig nach selten (siehe parsing.RARITY_ORDER)
     cards = relationship('Card', back_populates='rarity')
 
 class Type(Base):
@@ -57,17 +62,24 @@ class Card(Base):
     __tablename__ = 'cards'
     id = Column(Integer, primary_key=True) # Neuer, einheitlicher Primärschlüssel
     tcg_id = Column(String, nullable=False, unique=True, index=True) # Die alte ID wie "me01-1"
-    name = Column(String, nullable=False, index=True)
+    name = Column(String, nullable=False)
     image_url = Column(String, nullable=True)
     supertype = Column(String, nullable=False)
     hp = Column(Integer, nullable=True)
     number_in_set = Column(String, nullable=True)
     evolves_from = Column(String, nullable=True)
 
+    # Sortierschlüssel: numerische Sammlernummer ('1/132' -> 1) und das Erscheinungsdatum
+    # des Sets (denormalisiert, damit die Sortierung über einen einzigen Index laufen kann)
+    collector_number = Column(Integer, nullable=True)
+    set_release_date = Column(Date, nullable=True)
+    # Rang der Seltenheit (denormalisiert aus rarities.rank) für die Sortierung nach Seltenheit
+    rarity_rank = Column(Integer, nullable=True)
+
     # Fremdschlüssel zu den Lookup-Tabellen
     set_id = Column(Integer, ForeignKey('sets.id'))
     rarity_id = Column(Integer, ForeignKey('rarities.id'), nullable=True)
-    artist_id = Column(Integer, ForeignKey('artists.id'), nullable=True)
+    artist_id = Column(Integer, ForeignKey('artists.id'), nullable=True, index=True)
 
     # Beziehungen
     set = relationship('Set', back_populates='cards')
@@ -81,22 +93,57 @@ class Card(Base):
     abilities = relationship('Ability', back_populates='card', cascade="all, delete-orphan")
     rules = relationship('Rule', back_populates='card', cascade="all, delete-orphan")
 
+    # Zusammengesetzte Indizes für die Sortierungen der Kartensuche (jeweils mit der ID als Tiebreaker).
+    # Aufsteigend entspricht die Standardreihenfolge (NULLS LAST) der Sortierung, absteigend
+    # gibt es eigene Indizes mit DESC NULLS LAST (siehe unten).
+    __table_args__ = (
+        Index('ix_cards_name_id', 'name', 'id'),
+        Index('ix_cards_hp_id', 'hp', 'id'),
+        Index('ix_cards_rarity_id_id', 'rarity_id', 'id'),
+        Index('ix_cards_rarity_rank_id', 'rarity_rank', 'id'),
+        Index('ix_cards_release_order', 'set_release_date', 'collector_number', 'id'),
+        # Kartenliste eines Sets, sortiert nach Sammlernummer
+        Index('ix_cards_set_collector_number', 'set_id', 'collector_number', 'id'),
+    )
+
+# Absteigende Sortierungen mit Karten ohne Wert am Ende (ORDER BY ... DESC NULLS LAST)
+Index('ix_cards_hp_desc', Card.hp.desc().nulls_last(), Card.id.desc())
+Index('ix_cards_release_order_desc', Card.set_release_date.desc().nulls_last(),
+      Card.collector_number.desc().nulls_last(), Card.id.desc())
+Index('ix_cards_rarity_rank_desc', Card.rarity_rank.desc().nulls_last(), Card.id.desc())
+
 # --- Detail-Tabellen ---
 
 class Attack(Base):
     __tablename__ = 'attacks'
     id = Column(Integer, primary_key=True)
-    card_id = Column(Integer, ForeignKey('cards.id'))
+    card_id = Column(Integer, ForeignKey('cards.id'), index=True)
     name = Column(String, nullable=True) # Erlaubt leere Namen
     cost = Column(Text, nullable=True)
     damage = Column(String, nullable=True)
     text = Column(Text, nullable=True)
+    # Strukturierte Werte für Filter: Gesamtzahl der Energien und Schaden als Zahl ('30+' -> 30)
+    converted_cost = Column(Integer, nullable=True, index=True)
+    damage_value = Column(Integer, nullable=True, index=True)
     card = relationship('Card', back_populates='attacks')
+    cost_entries = relationship('AttackCost', back_populates='attack', cascade="all, delete-orphan")
+
+# Energiekosten einer Attacke pro Energietyp (z.B. 2x 'Feuer', 1x 'Farblos')
+class AttackCost(Base):
+    __tablename__ = 'attack_costs'
+    attack_id = Column(Integer, ForeignKey('attacks.id'), primary_key=True)
+    energy_type = Column(String, primary_key=True)
+    amount = Column(Integer, nullable=False)
+    attack = relationship('Attack', back_populates='cost_entries')
+
+    __table_args__ = (
+        Index('ix_attack_costs_energy_type_amount', 'energy_type', 'amount'),
+    )
 
 class Ability(Base):
     __tablename__ = 'abilities'
     id = Column(Integer, primary_key=True)
-    card_id = Column(Integer, ForeignKey('cards.id'))
+    card_id = Column(Integer, ForeignKey('cards.id'), index=True)
     name = Column(String, nullable=False)
     text = Column(Text, nullable=True)
     type = Column(String, nullable=True)
@@ -105,10 +152,31 @@ class Ability(Base):
 class Rule(Base):
     __tablename__ = 'rules'
     id = Column(Integer, primary_key=True)
-    card_id = Column(Integer, ForeignKey('cards.id'))
+    card_id = Column(Integer, ForeignKey('cards.id'), index=True)
     text = Column(Text, nullable=True) # Erlaubt leere Regeltexte
     card = relationship('Card', back_populates='rules')
 
+# --- Vorberechnete Katalog-Indizes ---
+
+# Eine Kante im Entwicklungsgraphen: 'name' entwickelt sich aus 'evolves_from'.
+# Wird beim Import aus Card.evolves_from aufgebaut.
+class Evolution(Base):
+    __tablename__ = 'evolutions'
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, index=True)
+    evolves_from = Column(String, nullable=False, index=True)
+
+    __table_args__ = (
+        UniqueConstraint('name', 'evolves_from', name='uq_evolution_edge'),
+    )
+
+# Einzeilige Tabelle mit der Version des zuletzt importierten Katalogs (siehe catalog.py)
+class CatalogInfo(Base):
+    __tablename__ = 'catalog_info'
+    id = Column(Integer, primary_key=True)
+    version = Column(String, nullable=False)
+    updated_at = Column(DateTime, nullable=True)
+
     # --- BENUTZER-TABELLE HINZUFÜGEN ---
 
 class User(Base):
@@ -125,7 +193,7 @@ class UserCollection(Base):
     __tablename__ = 'user_collections'
     # Jede Zeile ist eine eindeutige Kombination aus Benutzer und Karte
     user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
-    card_id = Column(Integer, ForeignKey('cards.id'), primary_key=True)
+    card_id = Column(Integer, ForeignKey('cards.id'), primary_key=True, index=True)
     quantity = Column(Integer, nullable=False, default=1)
 
     __table_args__ = (
@@ -0,0 +1,61 @@
+# parsing.py
+# Hilfsfunktionen, um Rohwerte aus den Kartendaten in strukturierte, indizierbare Werte umzuwandeln.
+import re
+from collections import Counter
+
+_NUMBER_PATTERN = re.compile(r"\d+")
+
+
+def parse_damage(damage):
+    """
+    Wandelt einen Schadenstext in eine Zahl um ('30' -> 30, '30+' -> 30, '20×' -> 20).
+    Gibt None zurück, wenn der Text keine Zahl enthält.
+    """
+    if not damage:
+        return None
+    match = _NUMBER_PATTERN.search(str(damage))
+    return int(match.group()) if match else None
+
+
+def parse_attack_cost(cost, converted_cost=None):
+    """
+    Zerlegt die Energiekosten einer Attacke (z.B. ['Feuer', 'Feuer', 'Farblos'])
+    in die Gesamtkosten und die Anzahl pro Energietyp ({'Feuer': 2, 'Farblos': 1}).
+    Einträge wie 'Free' zählen nicht als Energie.
+    """
+    energies = Counter(energy for energy in (cost or []) if energy and energy.lower() != "free")
+    total = converted_cost if converted_cost is not None else sum(energies.values())
+    return total, dict(energies)
+
+
+def parse_collector_number(number_in_set):
+    """
+    Ermittelt die numerische Sammlernummer aus der Nummer im Set
+    ('1/132' -> 1, 'TG05' -> 5, 'SWSH001' -> 1). Gibt None zurück, wenn keine Zahl enthalten ist.
+    """
+    if not number_in_set:
+        return None
+    match = _NUMBER_PATTERN.search(str(number_in_set).split("/")[0])
+    return int(match.group()) if match else None
+
+
+# Seltenheiten in aufsteigender Reihenfolge (Namen wie in den Kartendaten).
+# Unbekannte Seltenheiten werden alphabetisch dahinter einsortiert.
+RARITY_ORDER = [
+    "Common", "Uncommon", "Rare", "Rare Holo", "Rare Holo EX", "Rare Holo GX", "Rare Holo LV.X",
+    "Rare Holo Star", "Rare Holo V", "Rare Holo VMAX", "Rare Holo VSTAR", "Rare Prime", "Rare Prism Star",
+    "Rare BREAK", "Rare ACE", "ACE SPEC Rare", "Double Rare", "Amazing Rare", "Radiant Rare", "Rare Shining",
+    "Rare Shiny", "Rare Shiny GX", "Shiny Rare", "Trainer Gallery Rare Holo", "Classic Collection", "LEGEND",
+    "Rare Ultra", "Ultra Rare", "Shiny Ultra Rare", "Illustration Rare", "Rare Rainbow", "Rare Secret",
+    "Special Illustration Rare", "Hyper Rare", "Promo",
+]
+
+
+def rarity_ranks(names):
+    """
+    Ordnet jeder Seltenheit ihren Rang zu (0 = häufigste). Bekannte Namen folgen
+    RARITY_ORDER, unbekannte werden alphabetisch dahinter einsortiert.
+    """
+    known = {name: position for position, name in enumerate(RARITY_ORDER)}
+    ordered = sorted(set(names), key=lambda name: (name not in known, known.get(name, 0), name))
+    return {name: rank for rank, name in enumerate(ordered)}
@@ -0,0 +1,2 @@
+# perf/__init__.py
+# Werkzeuge zum Messen der API-Performance (synthetische Testdaten, Lasttests).
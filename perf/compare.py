@@ -0,0 +1,75 @@
+# perf/compare.py
+"""
+Vergleicht zwei mit `perf.loadtest --output` gespeicherte Läufe.
+
+    python -m perf.compare baseline.json candidate.json
+"""
+import argparse
+import json
+import sys
+
+METRICS = [
+    ("p50_ms", "p50 ms", False),
+    ("p95_ms", "p95 ms", False),
+    ("p99_ms", "p99 ms", False),
+    ("rps", "req/s", True),
+    ("queries_per_request", "SQL/Anfr.", False)
+]
+
+
+def _change(before, after):
+    if before in (None, 0) or after is None:
+        return None
+    return (after - before) / before * 100
+
+
+def compare_runs(baseline, candidate, threshold: float = 10.0):
+    """
+    Gibt pro Endpunkt und Metrik (alt, neu, Änderung in %, Verschlechterung?) zurück.
+    Eine Verschlechterung liegt vor, wenn sich die Metrik um mehr als
+    `threshold` Prozent in die ungünstige Richtung bewegt.
+    """
+    rows = []
+    labels = sorted(set(baseline["endpoints"]) | set(candidate["endpoints"]))
+    for label in labels:
+        before_stats = baseline["endpoints"].get(label, {})
+        after_stats = candidate["endpoints"].get(label, {})
+        for key, title, higher_is_better in METRICS:
+            before, after = before_stats.get(key), after_stats.get(key)
+            change = _change(before, after)
+            worse = change is not None and (change < -threshold if higher_is_better else change > threshold)
+            rows.append((label, title, before, after, change, worse))
+    return rows
+
+
+def _format(value):
+    return "-" if value is None else f"{value:.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vergleicht zwei Lasttest-Läufe.")
+    parser.add_argument("baseline", help="JSON-Datei des Referenzlaufs.")
+    parser.add_argument("candidate", help="JSON-Datei des neuen Laufs.")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Toleranz in Prozent, ab der eine Änderung als Verschlechterung gilt.")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    rows = compare_runs(baseline, candidate, args.threshold)
+    header = f"{'Endpunkt':<20}{'Metrik':<12}{'Alt':>10}{'Neu':>10}{'Änderung':>11}"
+    print(header)
+    print("-" * len(header))
+    for label, title, before, after, change, worse in rows:
+        change_text = "-" if change is None else f"{change:+.1f} %"
+        print(f"{label:<20}{title:<12}{_format(before):>10}{_format(after):>10}{change_text:>11}{'  <-- schlechter' if worse else ''}")
+
+    regressions = sum(1 for row in rows if row[5])
+    print(f"\n{regressions} Verschlechterung(en) über {args.threshold:.0f} %.")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+# perf/loadtest.py
+"""
+Lasttest für die API: treibt `main.app` mit mehreren gleichzeitigen Clients
+gegen eine (z.B. mit `perf.seed` befüllte) lokale Datenbank und misst pro
+Endpunkt Latenz-Perzentile, Durchsatz und SQL-Abfragen pro Anfrage.
+
+    python -m perf.loadtest --database-url postgresql://... --requests 5000 --concurrency 16 --output run.json
+    python -m perf.loadtest --database-url postgresql://primary/... --replica-url postgresql://replica/... --output run.json
+    python -m perf.compare baseline.json run.json
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import math
+import random
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import httpx
+from sqlalchemy import create_engine, event
+
+import models, database
+from routers.auth_utils import create_access_token
+from warmup import wait_until_ready
+
+# Zähler für die SQL-Anweisungen der gerade laufenden Anfrage (pro Client-Task)
+_statement_counter = contextvars.ContextVar("statement_counter", default=None)
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _statement_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+# --- Workload ---
+# Jeder Eintrag liefert eine Liste von Anfragen (label, method, url, params, auth).
+
+def _cards_search(rng, vocab):
+    params = {}
+    # Realistische Filterkombinationen, wie sie die Suchmaske erzeugt
+    combo = rng.choice(["name", "name_type", "type_rarity", "set", "set_type", "hp", "attack", "attack_cost",
+                        "supertype_subtype"])
+    if "name" in combo:
+        params["name"] = rng.choice(vocab["name_fragments"])
+    if "type" in combo:
+        # Mehrfachauswahl wie "Feuer oder Wasser"
+        params["type"] = rng.sample(vocab["types"], rng.randint(1, min(2, len(vocab["types"]))))
+    if "rarity" in combo:
+        params["rarity"] = rng.choice(vocab["rarities"])
+    if combo.startswith("set"):
+        params["set_name"] = rng.sample(vocab["sets"], rng.randint(1, min(3, len(vocab["sets"]))))
+    if combo == "hp":
+        params["hp_gte"] = rng.randrange(60, 200, 10)
+        params["hp_lt"] = params["hp_gte"] + 60
+    if combo == "attack":
+        params["attack_name"] = rng.choice(vocab["attack_fragments"])
+    if combo == "attack_cost":
+        params["attack_cost_lte"] = rng.randint(1, 3)
+        params["attack_energy"] = rng.choice(vocab["types"])
+        if rng.random() < 0.5:
+            params["attack_damage_gte"] = rng.choice([30, 60, 90])
+    if combo == "supertype_subtype":
+        params["supertype"] = "Pokémon"
+        params["subtype"] = rng.choice(vocab["subtypes"])
+    if rng.random() < 0.5:
+        params["sort"] = rng.choice(["name", "-hp", "release", "-release", "rarity"])
+    params["page"] = rng.randint(1, 3)
+    return [("cards_search", "GET", "/cards/", params, False)]
+
+
+def _cards_search_deep(rng, vocab):
+    params = {"page": rng.randint(vocab["deep_page_min"], vocab["deep_page_max"]), "page_size": 50}
+    if rng.random() < 0.5:
+        params["supertype"] = "Pokémon"
+    return [("cards_search_deep", "GET", "/cards/", params, False)]
+
+
+def _card_detail(rng, vocab):
+    return [("card_detail", "GET", f"/cards/{rng.choice(vocab['tcg_ids'])}", {}, False)]
+
+
+def _set_cards(rng, vocab):
+    return [("set_cards", "GET", f"/sets/{rng.choice(vocab['sets'])}/cards", {}, False)]
+
+
+def _autocomplete(rng, vocab):
+    # Simuliert das Tippen in das Suchfeld: eine Anfrage pro Tastendruck
+    name = rng.choice(vocab["card_names"])
+    return [("autocomplete", "GET", "/autocomplete", {"q": name[:length]}, False)
+            for length in range(1, min(len(name), 5) + 1)]
+
+
+def _collection_list(rng, vocab):
+    return [("collection_list", "GET", "/collection/cards", {}, True)]
+
+
+def _collection_update(rng, vocab):
+    tcg_id = rng.choice(vocab["tcg_ids"])
+    return [
+        ("collection_add", "POST", f"/collection/cards/{tcg_id}", {}, True),
+        ("collection_remove", "DELETE", f"/collection/cards/{tcg_id}", {}, True)
+    ]
+
+
+WORKLOAD = [
+    (_cards_search, 35),
+    (_cards_search_deep, 10),
+    (_card_detail, 25),
+    (_set_cards, 10),
+    (_autocomplete, 10),
+    (_collection_list, 10),
+    (_collection_update, 10)
+]
+
+
+def load_vocabulary(session_factory):
+    """Liest die Werte, aus denen die Anfragen zusammengesetzt werden, aus der Datenbank."""
+    with session_factory() as db:
+        card_names = [name for (name,) in db.query(models.Card.name).distinct()]
+        attack_names = [name for (name,) in db.query(models.Attack.name).distinct() if name]
+        total_cards = db.query(models.Card).count()
+        vocab = {
+            "card_names": card_names,
+            "tcg_ids": [tcg_id for (tcg_id,) in db.query(models.Card.tcg_id)],
+            "sets": [name for (name,) in db.query(models.Set.name)],
+            "types": [name for (name,) in db.query(models.Type.name)],
+            "subtypes": [name for (name,) in db.query(models.Subtype.name)],
+            "rarities": [name for (name,) in db.query(models.Rarity.name)],
+            "usernames": [name for (name,) in db.query(models.User.username).filter(models.User.is_active.isnot(False))],
+            "name_fragments": sorted({name[:3].lower() for name in card_names if len(name) >= 3}),
+            "attack_fragments": sorted({name[:4].lower() for name in attack_names if len(name) >= 4}),
+        }
+    last_page = max(1, total_cards // 50)
+    vocab["deep_page_min"] = max(1, last_page // 2)
+    vocab["deep_page_max"] = last_page
+    if not vocab["tcg_ids"] or not vocab["sets"]:
+        raise SystemExit("Die Datenbank enthält keine Karten. Zuerst `python -m perf.seed` ausführen.")
+    return vocab
+
+
+def _percentile(sorted_values, percent):
+    if not sorted_values:
+        return None
+    # Nearest-Rank-Verfahren
+    index = max(0, min(len(sorted_values) - 1, math.ceil(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, duration):
+    """Verdichtet die Einzelmessungen (label, Latenz in s, Statuscode, Anzahl SQL) pro Endpunkt."""
+    by_label = defaultdict(list)
+    for sample in samples:
+        by_label[sample[0]].append(sample)
+
+    endpoints = {}
+    for label, label_samples in sorted(by_label.items()):
+        latencies = sorted(sample[1] * 1000 for sample in label_samples)
+        endpoints[label] = {
+            "requests": len(label_samples),
+            "errors": sum(1 for sample in label_samples if sample[2] >= 400),
+            "rps": len(label_samples) / duration if duration else None,
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "p99_ms": _percentile(latencies, 99),
+            "queries_per_request": sum(sample[3] for sample in label_samples) / len(label_samples)
+        }
+    return endpoints
+
+
+async def run_load(app, vocab, total_requests: int, concurrency: int, warmup: int = 0, random_seed: int = 1):
+    """
+    Führt `total_requests` Workload-Schritte mit `concurrency` parallelen Clients
+    aus und gibt (Messwerte, Dauer in Sekunden) zurück.
+    """
+    weights = [weight for _, weight in WORKLOAD]
+    generators = [generator for generator, _ in WORKLOAD]
+    tokens = {username: create_access_token({"sub": username}) for username in vocab["usernames"]}
+    if not tokens:
+        generators = [generator for generator in generators if generator not in (_collection_list, _collection_update)]
+        weights = [weight for generator, weight in WORKLOAD if generator in generators]
+
+    samples = []
+    remaining = [0]
+
+    async def client_worker(worker_id: int, client: httpx.AsyncClient, record: bool):
+        rng = random.Random(random_seed * 1000 + worker_id + (0 if record else 500))
+        # Jeder Client arbeitet als fester Benutzer, wie ein eingeloggter Browser
+        username = rng.choice(sorted(tokens)) if tokens else None
+        headers = {"Authorization": f"Bearer {tokens[username]}"} if username else {}
+        counter = [0]
+        _statement_counter.set(counter)
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            generator = rng.choices(generators, weights=weights)[0]
+            for label, method, url, params, auth in generator(rng, vocab):
+                counter[0] = 0
+                started = time.perf_counter()
+                response = await client.request(method, url, params=params, headers=headers if auth else None)
+                elapsed = time.perf_counter() - started
+                if record:
+                    samples.append((label, elapsed, response.status_code, counter[0]))
+
+    async def run_phase(client: httpx.AsyncClient, steps: int, record: bool):
+        remaining[0] = steps
+        await asyncio.gather(*(client_worker(worker_id, client, record) for worker_id in range(concurrency)))
+
+    transport = httpx.ASGITransport(app=app)
+    # Der ASGI-Transport löst keine Lifespan-Events aus, daher wird die Start-Phase hier durchlaufen
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        # Wie ein Load-Balancer erst nach abgeschlossener Aufwärmphase der Anwendung starten
+        await asyncio.to_thread(wait_until_ready)
+        # Aufwärmphase (Verbindungspool, Caches), wird nicht gemessen
+        await run_phase(client, warmup, record=False)
+        started = time.perf_counter()
+        await run_phase(client, total_requests, record=True)
+        duration = time.perf_counter() - started
+    return samples, duration
+
+
+def print_report(endpoints):
+    header = f"{'Endpunkt':<20}{'Anfr.':>7}{'Fehler':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'SQL/Anfr.':>11}"
+    print(header)
+    print("-" * len(header))
+    for label, stats in endpoints.items():
+        print(f"{label:<20}{stats['requests']:>7}{stats['errors']:>7}{stats['rps']:>9.1f}"
+              f"{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}{stats['queries_per_request']:>11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lasttest für die Pokenizer API.")
+    parser.add_argument("--database-url", required=True, help="SQLAlchemy-URL der (befüllten) Benchmark-Datenbank.")
+    parser.add_argument("--replica-url", action="append", default=[],
+                        help="SQLAlchemy-URL eines Lese-Replikats (mehrfach angebbar). Standard: keine, alles auf --database-url.")
+    parser.add_argument("--requests", type=int, default=2000, help="Anzahl gemessener Workload-Schritte.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Anzahl paralleler Clients.")
+    parser.add_argument("--warmup", type=int, default=200, help="Nicht gemessene Schritte vor der Messung.")
+    parser.add_argument("--seed", type=int, default=1, help="Startwert des Zufallsgenerators.")
+    parser.add_argument("--output", help="Schreibt die Ergebnisse als JSON in diese Datei (für perf.compare).")
+    args = parser.parse_args()
+
+    # Import erst hier, damit `--help` auch ohne Bildverzeichnis funktioniert
+    import main as app_module
+
+    engine = create_engine(args.database_url, pool_size=args.concurrency, max_overflow=args.concurrency)
+    replicas = [create_engine(url, pool_size=args.concurrency, max_overflow=args.concurrency) for url in args.replica_url]
+    for counted_engine in [engine] + replicas:
+        event.listen(counted_engine, "before_cursor_execute", _count_statement)
+    # Alle Sessions der Anwendung (Routen und Aufwärmphase) nutzen die Benchmark-Datenbanken
+    database.configure_engines(engine, replicas)
+
+    vocab = load_vocabulary(database.SessionLocal)
+    samples, duration = asyncio.run(run_load(app_module.app, vocab, args.requests, args.concurrency,
+                                             warmup=args.warmup, random_seed=args.seed))
+    endpoints = summarize(samples, duration)
+
+    print(f"{len(samples)} Anfragen in {duration:.1f} s ({len(samples) / duration:.1f} req/s gesamt)\n")
+    print_report(endpoints)
+
+    if args.output:
+        result = {
+            "meta": {
+                "timestamp": datetime.utcnow().isoformat(),
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "replicas": len(replicas),
+                "seed": args.seed,
+                "duration_s": duration
+            },
+            "endpoints": endpoints
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nErgebnisse gespeichert in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# perf/plan_check.py
+"""
+Prüft die Ausführungspläne der Lese-Routen auf PostgreSQL.
+
+Das Skript befüllt eine lokale Datenbank per Migration mit einem großen
+synthetischen Katalog, ruft die Routen auf und lässt für jede dabei
+ausgeführte SQL-Anweisung mit denselben Parametern `EXPLAIN (FORMAT JSON)`
+laufen. Ein sequenzieller Scan über eine große Tabelle (ab --min-rows Zeilen
+laut Statistik) gilt als Plan-Regression, sofern er für den Fall nicht
+ausdrücklich erlaubt ist - typischerweise fehlt dann ein Index oder eine
+Abfrage kann ihn nicht mehr nutzen.
+
+    python -m perf.plan_check --database-url postgresql://postgres:pw@localhost/pokenizer_bench   (wird geleert!)
+"""
+import argparse
+import sys
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+
+import database, catalog, warmup
+from perf.seed import seed_database
+from perf.query_budget import _sample_values
+from routers.auth_utils import create_access_token
+from routers.cards import SORT_OPTIONS
+
+# Ab dieser Zeilenzahl (pg_class.reltuples) gilt eine Tabelle als groß
+DEFAULT_MIN_ROWS = 20000
+DEFAULT_SEED_OPTIONS = {"sets": 120, "cards_per_set": 400, "users": 50, "collection_size": 400}
+
+
+def _plan_cases(values):
+    """
+    Die geprüften Aufrufe als (Bezeichnung, URL, Optionen, erlaubte Seq-Scans, kalter Cache,
+    Reihenfolge aus dem Index). Bei letzterem darf kein Plan einen Sort-Knoten enthalten.
+    Bei warmem Cache wird die Route vorher einmal ungemessen aufgerufen, damit nur
+    ihre eigenen Abfragen geprüft werden und nicht die gecachten Übersichten.
+    Routen, deren Ergebnis selbst gecacht wird, laufen mit kaltem Cache.
+    """
+    auth = {"headers": {"Authorization": f"Bearer {create_access_token({'sub': values['username']})}"}}
+    cases = [
+        # Die Detailansicht wird pro Karte gecacht; warm würde sie kein SQL ausführen
+        ("Kartendetails (kalter Cache)", f"/cards/{values['tcg_id']}", {}, set(), True),
+        ("Entwicklungsreihe", f"/cards/{values['tcg_id']}/evolutions", {}, set(), False),
+        ("Suche: Typ und Seltenheit", "/cards/",
+         {"params": {"type": values["type_name"], "rarity": "Rare Ultra"}}, set(), False),
+        ("Suche: Attacke nach Energie und Schaden", "/cards/",
+         {"params": {"attack_energy": values["type_name"], "attack_damage_gte": 120}}, set(), False),
+        ("Suche: Set nach Erscheinungsreihenfolge", "/cards/",
+         {"params": {"set_name": values["set_name"], "sort": "release"}}, set(), False),
+        ("Suche: Künstler", "/cards/", {"params": {"artist": values["artist_name"]}}, set(), False),
+        # ILIKE '%...%' kann keinen B-Baum-Index nutzen
+        ("Suche: Namensteil", "/cards/", {"params": {"name": values["card_name"][1:4]}}, {"cards"}, False),
+        # Die Gesamtzahl ohne Filter zählt zwangsläufig alle Karten
+        ("Suche: ohne Filter nach Name", "/cards/", {"params": {"sort": "name"}}, {"cards"}, False),
+        ("Set-Karten", f"/sets/{values['set_name']}/cards", {}, set(), False),
+        ("Set-Karten, Cursor in der Mitte", f"/sets/{values['set_name']}/cards",
+         {"params": {"cursor": values["set_cursor"]}}, set(), False),
+        ("Set-Karten, Cursor bei Karten ohne Nummer", f"/sets/{values['set_name']}/cards",
+         {"params": {"cursor": ":0"}}, set(), False),
+        ("Künstler-Karten", f"/artists/{values['artist_name']}/cards", {}, set(), False),
+        ("Sammlung", "/collection/cards", auth, set(), False),
+        # Die Übersichten aggregieren bewusst über alle Karten und werden pro Katalog-Version gecacht
+        ("Set-Übersicht (kalter Cache)", "/sets", {}, {"cards"}, True),
+        ("Künstler-Übersicht (kalter Cache)", "/artists", {}, {"cards"}, True),
+    ]
+    cases = [case + (False,) for case in cases]
+    # Jede Sortierung muss ihre Seite direkt aus einem passenden Index lesen; die
+    # Gesamtzahl ohne Filter zählt dabei zwangsläufig alle Karten
+    for sort in SORT_OPTIONS:
+        cases.append((f"Sortierung: {sort}", "/cards/", {"params": {"sort": sort}}, {"cards"}, False, True))
+    return cases
+
+
+def _middle_cursor(engine, set_name: str) -> str:
+    """Ein Cursor auf die Karte in der Mitte eines Sets (wie ihn /sets/{set_name}/cards liefert)."""
+    with engine.connect() as connection:
+        collector_number, card_id = connection.execute(text(
+            "SELECT c.collector_number, c.id FROM cards c JOIN sets s ON s.id = c.set_id WHERE s.name = :name "
+            "ORDER BY c.collector_number NULLS LAST, c.id "
+            "OFFSET (SELECT COUNT(*) / 2 FROM cards c2 JOIN sets s2 ON s2.id = c2.set_id WHERE s2.name = :name) LIMIT 1"
+        ), {"name": set_name}).one()
+    return f"{'' if collector_number is None else collector_number}:{card_id}"
+
+
+def _table_sizes(engine):
+    """Geschätzte Zeilenzahl pro Tabelle aus der Planer-Statistik."""
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            "SELECT c.relname, c.reltuples FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relkind = 'r' AND n.nspname = current_schema()"
+        ).all()
+    return {name: reltuples for name, reltuples in rows}
+
+
+def _seq_scans(plan):
+    """Liefert die Tabellennamen aller Seq-Scan-Knoten eines Plans (rekursiv)."""
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", ()):
+        yield from _seq_scans(child)
+
+
+def _sorts(plan):
+    """Liefert alle Sort-Knoten eines Plans (rekursiv)."""
+    if plan.get("Node Type") in ("Sort", "Incremental Sort"):
+        yield plan
+    for child in plan.get("Plans", ()):
+        yield from _sorts(child)
+
+
+def _capture(engine, client, url, options):
+    """Führt die Anfrage aus und gibt die SELECT-Anweisungen samt Parametern zurück."""
+    captured = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        response = client.get(url, **options)
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    if response.status_code >= 400:
+        raise RuntimeError(f"GET {url} lieferte {response.status_code}: {response.text}")
+    return captured
+
+
+def check_plans(app, engine, min_rows: int = DEFAULT_MIN_ROWS, seed_options=None):
+    """Befüllt die Datenbank, prüft alle Fälle und gibt die Liste der Fehler zurück."""
+    seed_database(engine, **(seed_options or DEFAULT_SEED_OPTIONS))
+    sizes = _table_sizes(engine)
+    large_tables = {name for name, rows in sizes.items() if rows >= min_rows}
+    print("Große Tabellen:", ", ".join(f"{name} (~{int(sizes[name])})" for name in sorted(large_tables)) or "-")
+
+    values = _sample_values(database.SessionLocal)
+    values["set_cursor"] = _middle_cursor(engine, values["set_name"])
+    failures = []
+    with TestClient(app) as client:
+        warmup.wait_until_ready(timeout=300)
+        for label, url, options, allowed, cold, index_order in _plan_cases(values):
+            if cold:
+                catalog.invalidate()
+            else:
+                client.get(url, **options)
+            statements = _capture(engine, client, url, options)
+            if not statements:
+                failures.append(f"{label}: keine SQL-Anweisungen erfasst, der Fall prüft nichts")
+
+            scanned, unsorted = set(), False
+            with engine.connect() as connection:
+                for statement, parameters in statements:
+                    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+                    offending = {table for table in _seq_scans(plan[0]["Plan"]) if table in large_tables}
+                    scanned |= offending
+                    for table in sorted(offending - allowed):
+                        failures.append(f"{label}: Seq Scan auf '{table}'\n{statement}\nParameter: {parameters!r}")
+                    if index_order and any(True for _ in _sorts(plan[0]["Plan"])):
+                        unsorted = True
+                        failures.append(f"{label}: Sort-Knoten statt Reihenfolge aus dem Index\n{statement}\nParameter: {parameters!r}")
+            status = "OK" if scanned <= allowed and not unsorted else "FEHLER"
+            print(f"{label:<45}{len(statements):>4} Abfragen  Seq Scans: {', '.join(sorted(scanned)) or '-':<20}{status}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prüft die Ausführungspläne der Lese-Routen auf sequenzielle Scans großer Tabellen.")
+    parser.add_argument("--database-url", required=True, help="SQLAlchemy-URL einer lokalen PostgreSQL-Datenbank (wird geleert!).")
+    parser.add_argument("--min-rows", type=int, default=DEFAULT_MIN_ROWS, help="Ab dieser Zeilenzahl gilt eine Tabelle als groß.")
+    args = parser.parse_args()
+
+    import main as app_module
+
+    engine = create_engine(args.database_url)
+    if engine.dialect.name != "postgresql":
+        parser.error("Die Plan-Prüfung benötigt eine PostgreSQL-Datenbank.")
+    database.configure_engines(engine)
+
+    failures = check_plans(app_module.app, engine, min_rows=args.min_rows)
+    if failures:
+        print("\nPlan-Regressionen gefunden:\n\n" + "\n\n".join(failures))
+        sys.exit(1)
+    print("\nKeine sequenziellen Scans über große Tabellen außerhalb der erlaubten Fälle.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# perf/query_budget.py
+"""
+Schutz gegen Query-Regressionen (z.B. N+1 durch Lazy-Loading).
+
+`assert_max_queries` ist ein wiederverwendbarer Context-Manager, der alle
+SQL-Anweisungen einer Engine mitschreibt und bei Überschreitung eines Budgets
+mit der Liste der Anweisungen fehlschlägt.
+
+Als Skript ausgeführt, befüllt das Modul eine lokale Datenbank nacheinander
+in zwei Größen, ruft jede Route der API auf und prüft, dass
+- die Anzahl der SQL-Anweisungen das Budget in ROUTE_BUDGETS nicht überschreitet,
+- die Anzahl nicht mit der Datenmenge wächst,
+- jede Route der API ein Budget hat,
+- Katalog-Routen nur das Lese-Replikat verwenden und Routen mit
+  Benutzerdaten nur die Primärdatenbank (als Replikat dient eine zweite
+  Engine auf dieselbe Datenbank).
+
+    python -m perf.query_budget                      # SQLite im Speicher
+    python -m perf.query_budget --database-url postgresql://...   (wird geleert!)
+"""
+import argparse
+import sys
+from contextlib import contextmanager
+
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+import models, database, catalog, warmup
+from perf.seed import seed_database
+from routers.auth_utils import create_access_token
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def record_queries(engine):
+    """Schreibt alle SQL-Anweisungen der Engine im Block in eine Liste."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+@contextmanager
+def assert_max_queries(engine, budget: int, label: str = ""):
+    """Schlägt fehl, wenn im Block mehr als `budget` SQL-Anweisungen laufen."""
+    with record_queries(engine) as statements:
+        yield statements
+    if len(statements) > budget:
+        listing = "\n\n".join(f"[{index}] {statement}" for index, statement in enumerate(statements, 1))
+        raise QueryBudgetExceeded(f"{label or 'Block'}: {len(statements)} SQL-Anweisungen, Budget {budget}\n\n{listing}")
+
+
+# --- Budgets pro Route ---
+# (Methode, Routen-Template, maximale Anzahl SQL-Anweisungen)
+# Die Budgets gelten für kalte Caches (inkl. Lesen der Katalog-Version) und
+# für authentifizierte Routen inkl. der Benutzerabfrage.
+ROUTE_BUDGETS = {
+    ("GET", "/"): 0,
+    ("GET", "/metrics"): 0,
+    ("GET", "/cards/"): 4,
+    ("GET", "/cards/{tcg_id}"): 10,
+    ("GET", "/cards/{tcg_id}/evolutions"): 6,
+    ("POST", "/users/register"): 4,
+    ("POST", "/token"): 1,
+    ("GET", "/sets/{set_name}/cards"): 5,
+    ("GET", "/sets"): 2,
+    ("GET", "/rarities/"): 2,
+    ("GET", "/types/"): 2,
+    ("GET", "/collection/cards"): 5,
+    ("POST", "/collection/cards/{tcg_id}"): 4,
+    ("DELETE", "/collection/cards/{tcg_id}"): 4,
+    ("GET", "/artists"): 2,
+    ("GET", "/artists/{artist_name}/cards"): 5,
+    ("GET", "/autocomplete"): 5,
+    ("GET", "/health/live"): 0,
+    ("GET", "/health/ready"): 0,
+}
+
+# Routen, die Benutzerdaten lesen oder schreiben und daher auf der Primärdatenbank
+# bleiben. Alle anderen Routen dürfen ausschließlich das Lese-Replikat verwenden.
+PRIMARY_ROUTES = {
+    ("POST", "/users/register"),
+    ("POST", "/token"),
+    ("GET", "/collection/cards"),
+    ("POST", "/collection/cards/{tcg_id}"),
+    ("DELETE", "/collection/cards/{tcg_id}"),
+}
+
+
+def _sample_values(session_factory):
+    """Sucht passende Pfad- und Query-Parameter aus der befüllten Datenbank."""
+    with session_factory() as db:
+        evolved_card = db.query(models.Card).filter(models.Card.evolves_from.isnot(None)).order_by(models.Card.id).first()
+        user = db.query(models.User).order_by(models.User.id).first()
+        owned = db.query(models.UserCollection).filter(models.UserCollection.user_id == user.id).first()
+        unowned_card = db.query(models.Card).filter(
+            ~models.Card.id.in_(db.query(models.UserCollection.card_id).filter(models.UserCollection.user_id == user.id))
+        ).first()
+        return {
+            "tcg_id": evolved_card.tcg_id,
+            "owned_tcg_id": db.get(models.Card, owned.card_id).tcg_id,
+            "unowned_tcg_id": unowned_card.tcg_id,
+            "set_name": db.query(models.Set.name).order_by(models.Set.id).limit(1).scalar(),
+            "artist_name": db.query(models.Artist.name).order_by(models.Artist.id).limit(1).scalar(),
+            "card_name": evolved_card.name,
+            "type_name": db.query(models.Type.name).order_by(models.Type.id).limit(1).scalar(),
+            "username": user.username
+        }
+
+
+def _route_requests(values, run: int):
+    """Die Aufrufe (Methode, Routen-Template, URL, Optionen) für alle Routen."""
+    auth = {"headers": {"Authorization": f"Bearer {create_access_token({'sub': values['username']})}"}}
+    return [
+        ("GET", "/", "/", {}),
+        ("GET", "/metrics", "/metrics", {}),
+        ("GET", "/cards/", "/cards/", {"params": {"supertype": "Pokémon", "type": values["type_name"], "page_size": 100}}),
+        ("GET", "/cards/{tcg_id}", f"/cards/{values['tcg_id']}", {}),
+        ("GET", "/cards/{tcg_id}/evolutions", f"/cards/{values['tcg_id']}/evolutions", {}),
+        ("POST", "/users/register", "/users/register",
+         {"json": {"username": f"budget{run}", "email": f"budget{run}@example.com", "password": "budget"}}),
+        ("POST", "/token", "/token", {"data": {"username": values["username"], "password": "falsch"}}),
+        ("GET", "/sets/{set_name}/cards", f"/sets/{values['set_name']}/cards", {}),
+        ("GET", "/sets", "/sets", {}),
+        ("GET", "/rarities/", "/rarities/", {}),
+        ("GET", "/types/", "/types/", {}),
+        ("GET", "/collection/cards", "/collection/cards", auth),
+        ("POST", "/collection/cards/{tcg_id}", f"/collection/cards/{values['unowned_tcg_id']}", auth),
+        ("DELETE", "/collection/cards/{tcg_id}", f"/collection/cards/{values['owned_tcg_id']}", auth),
+        ("GET", "/artists", "/artists", {}),
+        ("GET", "/artists/{artist_name}/cards", f"/artists/{values['artist_name']}/cards", {"params": {"page_size": 100}}),
+        ("GET", "/autocomplete", "/autocomplete", {"params": {"q": values["card_name"][:3]}}),
+        ("GET", "/health/live", "/health/live", {}),
+        ("GET", "/health/ready", "/health/ready", {}),
+    ]
+
+
+def measure_routes(app, engine, replica, seed_options, run: int):
+    """
+    Befüllt die Datenbank und gibt pro Route die Anzahl SQL-Anweisungen
+    insgesamt und davon auf dem Replikat zurück.
+    """
+    seed_database(engine, **seed_options)
+    values = _sample_values(database.SessionLocal)
+
+    counts = {}
+    # Die Aufwärmphase läuft beim Öffnen des Clients gegen die frisch befüllte Datenbank
+    with TestClient(app) as client:
+        if not warmup.wait_until_ready(timeout=120):
+            raise RuntimeError("Die Aufwärmphase wurde nicht abgeschlossen.")
+        for method, template, url, options in _route_requests(values, run):
+            # Jede Route wird mit kalten Caches gemessen, damit das Budget den schlechtesten Fall abdeckt
+            catalog.invalidate()
+            # Der Listener auf der Primär-Engine sieht auch die Anweisungen des Replikats
+            with record_queries(engine) as statements, record_queries(replica) as replica_statements:
+                response = client.request(method, url, **options)
+            if response.status_code >= 500:
+                raise RuntimeError(f"{method} {url} lieferte {response.status_code}: {response.text}")
+            counts[(method, template)] = (len(statements), len(replica_statements))
+    return counts
+
+
+def check_budgets(app, engine, replica):
+    """Prüft alle Routen gegen ROUTE_BUDGETS und PRIMARY_ROUTES und gibt die Liste der Fehler zurück."""
+    small = measure_routes(app, engine, replica, {"sets": 2, "cards_per_set": 15, "users": 2, "collection_size": 5}, run=1)
+    large = measure_routes(app, engine, replica, {"sets": 6, "cards_per_set": 80, "users": 2, "collection_size": 120}, run=2)
+
+    failures = []
+    api_routes = {(method, route.path) for route in app.routes if isinstance(route, APIRoute) for method in route.methods}
+    for key in sorted(api_routes - set(ROUTE_BUDGETS)):
+        failures.append(f"{key[0]} {key[1]}: kein Budget in ROUTE_BUDGETS hinterlegt")
+
+    print(f"{'Route':<45}{'Budget':>8}{'klein':>8}{'groß':>8}{'Replikat':>10}")
+    print("-" * 79)
+    for key, budget in ROUTE_BUDGETS.items():
+        (small_count, _), (large_count, replica_count) = small.get(key), large.get(key)
+        print(f"{key[0] + ' ' + key[1]:<45}{budget:>8}{small_count:>8}{large_count:>8}{replica_count:>10}")
+        if key in PRIMARY_ROUTES and replica_count:
+            failures.append(f"{key[0]} {key[1]}: {replica_count} SQL-Anweisungen auf dem Replikat statt der Primärdatenbank")
+        if key not in PRIMARY_ROUTES and replica_count != large_count:
+            failures.append(f"{key[0]} {key[1]}: {large_count - replica_count} SQL-Anweisungen auf der Primärdatenbank statt dem Replikat")
+        if large_count > budget or small_count > budget:
+            failures.append(f"{key[0]} {key[1]}: {max(small_count, large_count)} SQL-Anweisungen, Budget {budget}")
+        if large_count != small_count:
+            failures.append(f"{key[0]} {key[1]}: Anzahl wächst mit der Datenmenge ({small_count} -> {large_count})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prüft die Anzahl der SQL-Anweisungen pro Route gegen feste Budgets.")
+    parser.add_argument("--database-url", help="SQLAlchemy-URL einer lokalen Test-Datenbank (wird geleert!). Standard: SQLite im Speicher.")
+    args = parser.parse_args()
+
+    import main as app_module
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    # Alle Sessions der Anwendung (Routen und Aufwärmphase) nutzen die Test-Datenbank. Als
+    # Replikat dient eine zweite Engine auf dieselbe Datenbank, um die Zuordnung der Routen zu prüfen.
+    replica = engine.execution_options(logging_token="replica")
+    database.configure_engines(engine, [replica])
+
+    failures = check_budgets(app_module.app, engine, replica)
+    if failures:
+        print("\nQuery-Budgets überschritten:\n- " + "\n- ".join(failures))
+        sys.exit(1)
+    print("\nAlle Routen innerhalb ihres Query-Budgets.")
+
+
+if __name__ == "__main__":
+    main()
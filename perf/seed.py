@@ -0,0 +1,213 @@
+# perf/seed.py
+"""
+Befüllt eine lokale Datenbank mit einem synthetischen Katalog sowie Benutzern
+und Sammlungen in konfigurierbarer Größe.
+
+Achtung: Alle vorhandenen Tabellen der Ziel-Datenbank werden gelöscht.
+
+    python -m perf.seed --database-url postgresql://postgres:pw@localhost/pokenizer_bench
+"""
+import argparse
+import random
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+import models, catalog
+from migrate import reset_database
+from parsing import parse_attack_cost, parse_damage, rarity_ranks
+from routers.auth_utils import get_password_hash
+
+# --- Vokabular für den synthetischen Katalog ---
+TYPES = ["Feuer", "Wasser", "Pflanze", "Elektro", "Psycho", "Kampf", "Finsternis", "Metall", "Fee", "Drache", "Farblos"]
+SUBTYPES_BY_STAGE = ["Basis", "Phase-1", "Phase-2"]
+EXTRA_SUBTYPES = ["ex", "V", "GX"]
+RARITIES = ["Common", "Uncommon", "Rare", "Rare Holo", "Rare Ultra", "Promo"]
+RARITY_WEIGHTS = [50, 25, 12, 8, 4, 1]
+SYLLABLES = ["cha", "ri", "zar", "pi", "ka", "chu", "bul", "ba", "saur", "squ", "ir", "tle", "mew", "gen", "gar",
+             "don", "eev", "ee", "lap", "ras", "snor", "lax", "dra", "ni", "te", "gy", "ara", "dos", "vul", "pix"]
+ATTACK_WORDS = ["Flammen", "Wasser", "Blitz", "Donner", "Blatt", "Schatten", "Psycho", "Stahl", "Drachen", "Tackle"]
+ATTACK_SUFFIXES = ["wurf", "strahl", "schlag", "sturm", "klinge", "welle", "biss", "tritt"]
+DAMAGE_VALUES = ["", "10", "20", "30", "30+", "40", "50", "60", "80", "90", "120", "20×", "100-"]
+BENCHMARK_PASSWORD = "benchmark"
+
+
+def _make_name(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+
+def _make_families(rng: random.Random, count: int):
+    """Erzeugt Entwicklungsreihen mit ein bis drei Stufen und eindeutigen Namen."""
+    families, used = [], set()
+    while len(families) < count:
+        stages = []
+        for _ in range(rng.choices([1, 2, 3], weights=[3, 3, 2])[0]):
+            name = _make_name(rng)
+            while name in used:
+                name = _make_name(rng)
+            used.add(name)
+            stages.append(name)
+        families.append(stages)
+    return families
+
+
+def seed_database(engine, sets: int = 40, cards_per_set: int = 150, users: int = 50,
+                  collection_size: int = 200, random_seed: int = 42):
+    """
+    Setzt die Datenbank zurück und füllt sie mit synthetischen Daten.
+    Gibt eine Zusammenfassung mit den Zeilenanzahlen zurück.
+    """
+    rng = random.Random(random_seed)
+
+    reset_database(engine)
+
+    set_rows = [
+        {"id": i + 1, "name": f"Set {i + 1:03d}", "release_date": date(1999, 1, 9) + timedelta(days=90 * i),
+         "symbol_url": f"/images/set{i + 1}/set{i + 1}-expansion-symbol.png"}
+        for i in range(sets)
+    ]
+    # IDs wie beim echten Import alphabetisch, die Reihenfolge steckt nur im Rang
+    rarity_rank_map = rarity_ranks(RARITIES)
+    rarity_rows = [{"id": i + 1, "name": name, "rank": rarity_rank_map[name]} for i, name in enumerate(sorted(RARITIES))]
+    rarity_ids = {row["name"]: row["id"] for row in rarity_rows}
+    type_rows = [{"id": i + 1, "name": name} for i, name in enumerate(TYPES)]
+    subtype_names = SUBTYPES_BY_STAGE + EXTRA_SUBTYPES
+    subtype_rows = [{"id": i + 1, "name": name} for i, name in enumerate(subtype_names)]
+    artist_rows = [{"id": i + 1, "name": f"Artist {i + 1:03d}"} for i in range(max(10, sets * 3))]
+
+    families = _make_families(rng, max(10, sets * cards_per_set // 8))
+    card_rows, card_type_rows, card_subtype_rows = [], [], []
+    attack_rows, attack_cost_rows, ability_rows, rule_rows = [], [], [], []
+    evolution_edges = set()
+
+    card_id = 0
+    for set_row in set_rows:
+        for number in range(1, cards_per_set + 1):
+            card_id += 1
+            supertype = rng.choices(["Pokémon", "Trainer", "Energy"], weights=[80, 15, 5])[0]
+            evolves_from, hp = None, None
+            if supertype == "Pokémon":
+                family = rng.choice(families)
+                stage = rng.randrange(len(family))
+                name = family[stage]
+                evolves_from = family[stage - 1] if stage > 0 else None
+                hp = rng.randrange(30, 340, 10)
+                if evolves_from:
+                    evolution_edges.add((name, evolves_from))
+                card_type_rows.append({"card_id": card_id, "type_id": rng.randrange(len(TYPES)) + 1})
+                card_subtype_rows.append({"card_id": card_id, "subtype_id": stage + 1})
+                if rng.random() < 0.1:
+                    card_subtype_rows.append({"card_id": card_id,
+                                              "subtype_id": len(SUBTYPES_BY_STAGE) + rng.randrange(len(EXTRA_SUBTYPES)) + 1})
+                for _ in range(rng.randint(1, 2)):
+                    cost = [rng.choice(TYPES) for _ in range(rng.randint(0, 4))]
+                    damage = rng.choice(DAMAGE_VALUES)
+                    converted_cost, energy_counts = parse_attack_cost(cost)
+                    attack_id = len(attack_rows) + 1
+                    attack_rows.append({
+                        "id": attack_id,
+                        "card_id": card_id,
+                        "name": f"{rng.choice(ATTACK_WORDS)}{rng.choice(ATTACK_SUFFIXES)}",
+                        "cost": ", ".join(cost),
+                        "damage": damage,
+                        "text": "Synthetischer Attackentext.",
+                        "converted_cost": converted_cost,
+                        "damage_value": parse_damage(damage)
+                    })
+                    attack_cost_rows.extend({"attack_id": attack_id, "energy_type": energy, "amount": amount}
+                                            for energy, amount in energy_counts.items())
+                if rng.random() < 0.15:
+                    ability_rows.append({"card_id": card_id, "name": f"Fähigkeit {rng.randint(1, 50)}",
+                                         "text": "Synthetischer Fähigkeitstext.", "type": "Fähigkeit"})
+            elif supertype == "Trainer":
+                name = f"Trainer {rng.randint(1, 120)}"
+                rule_rows.append({"card_id": card_id, "text": "Du darfst während deines Zuges beliebig viele Item-Karten spielen."})
+            else:
+                name = f"{rng.choice(TYPES)}-Energie"
+
+            rarity = rng.choices(RARITIES, weights=RARITY_WEIGHTS)[0]
+            card_rows.append({
+                "id": card_id,
+                "tcg_id": f"set{set_row['id']}-{number}",
+                "name": name,
+                "image_url": f"/images/set{set_row['id']}/set{set_row['id']}-{number}.png",
+                "supertype": supertype,
+                "hp": hp,
+                "number_in_set": str(number),
+                "collector_number": number,
+                "set_release_date": set_row["release_date"],
+                "evolves_from": evolves_from,
+                "set_id": set_row["id"],
+                "rarity_id": rarity_ids[rarity],
+                "rarity_rank": rarity_rank_map[rarity],
+                "artist_id": rng.randrange(len(artist_rows)) + 1
+            })
+
+    hashed_password = get_password_hash(BENCHMARK_PASSWORD)
+    user_rows = [
+        {"id": i + 1, "username": f"bench{i + 1}", "email": f"bench{i + 1}@example.com",
+         "hashed_password": hashed_password, "is_active": True}
+        for i in range(users)
+    ]
+    collection_rows = []
+    for user_row in user_rows:
+        for owned_card_id in rng.sample(range(1, card_id + 1), min(collection_size, card_id)):
+            collection_rows.append({"user_id": user_row["id"], "card_id": owned_card_id, "quantity": rng.randint(1, 4)})
+
+    with Session(engine) as session:
+        for model, rows in [
+            (models.Set, set_rows), (models.Rarity, rarity_rows), (models.Type, type_rows),
+            (models.Subtype, subtype_rows), (models.Artist, artist_rows), (models.Card, card_rows),
+            (models.Attack, attack_rows), (models.AttackCost, attack_cost_rows),
+            (models.Ability, ability_rows), (models.Rule, rule_rows),
+            (models.User, user_rows), (models.UserCollection, collection_rows)
+        ]:
+            if rows:
+                session.execute(insert(model), rows)
+        if card_type_rows:
+            session.execute(models.card_types_table.insert(), card_type_rows)
+        if card_subtype_rows:
+            session.execute(models.card_subtypes_table.insert(), card_subtype_rows)
+        if evolution_edges:
+            session.execute(insert(models.Evolution),
+                            [{"name": name, "evolves_from": parent} for name, parent in sorted(evolution_edges)])
+        session.commit()
+        catalog.bump_catalog_version(session)
+
+    # Die expliziten IDs umgehen die Sequenzen; diese müssen für spätere Inserts nachgezogen werden
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            for table in ["sets", "rarities", "types", "subtypes", "artists", "cards", "attacks", "users"]:
+                connection.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}"
+                )
+            connection.exec_driver_sql("ANALYZE")
+
+    return {
+        "sets": len(set_rows),
+        "cards": len(card_rows),
+        "attacks": len(attack_rows),
+        "users": len(user_rows),
+        "collection_items": len(collection_rows)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Befüllt eine lokale Datenbank mit synthetischen Benchmark-Daten.")
+    parser.add_argument("--database-url", required=True, help="SQLAlchemy-URL der Benchmark-Datenbank (wird geleert!).")
+    parser.add_argument("--sets", type=int, default=40, help="Anzahl der Sets.")
+    parser.add_argument("--cards-per-set", type=int, default=150, help="Karten pro Set.")
+    parser.add_argument("--users", type=int, default=50, help="Anzahl der Benutzer.")
+    parser.add_argument("--collection-size", type=int, default=200, help="Verschiedene Karten pro Sammlung.")
+    parser.add_argument("--seed", type=int, default=42, help="Startwert des Zufallsgenerators.")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    summary = seed_database(engine, sets=args.sets, cards_per_set=args.cards_per_set, users=args.users,
+                            collection_size=args.collection_size, random_seed=args.seed)
+    print("Benchmark-Datenbank befüllt:", ", ".join(f"{key}={value}" for key, value in summary.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# routers/artists.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from typing import List
+import math
+
+import models, schemas, database, catalog, instrumentation
+
+router = APIRouter(
+    prefix="/artists",
+    tags=["Artists"],
+    route_class=instrumentation.TimedRoute
+)
+
+
+def _load_artist_summaries(db: Session):
+    """
+    Berechnet für alle Künstler die Kartenanzahl sowie das erste und letzte Set
+    mit einer einzigen, nach Künstler und Set gruppierten Abfrage.
+    """
+    rows = db.query(
+        models.Artist.id,
+        models.Artist.name,
+        models.Set.name,
+        models.Set.release_date,
+        func.count(models.Card.id)
+    ).join(models.Card, models.Card.artist_id == models.Artist.id).outerjoin(
+        models.Set, models.Card.set_id == models.Set.id
+    ).group_by(
+        models.Artist.id, models.Artist.name, models.Set.id, models.Set.name, models.Set.release_date
+    ).all()
+
+    summaries = {}
+    for artist_id, artist_name, set_name, release_date, card_count in rows:
+        summary = summaries.setdefault(artist_name, {
+            "id": artist_id,
+            "name": artist_name,
+            "card_count": 0,
+            "first_set": None,
+            "last_set": None,
+            "_first_key": None,
+            "_last_key": None
+        })
+        summary["card_count"] += card_count
+        if set_name is None:
+            continue
+        # Sets ohne Datum werden hinter allen datierten Sets einsortiert
+        sort_key = (release_date is None, release_date or 0, set_name)
+        if summary["_first_key"] is None or sort_key < summary["_first_key"]:
+            summary["_first_key"], summary["first_set"] = sort_key, set_name
+        if summary["_last_key"] is None or sort_key > summary["_last_key"]:
+            summary["_last_key"], summary["last_set"] = sort_key, set_name
+
+    for summary in summaries.values():
+        del summary["_first_key"], summary["_last_key"]
+    return summaries
+
+
+def get_artist_summaries(db: Session):
+    """Gibt die Künstler-Übersicht zurück (pro Katalog-Version gecacht)."""
+    return catalog.cached(db, "artist_summaries", _load_artist_summaries)
+
+
+@router.get("", response_model=List[schemas.ArtistSummary])
+def get_all_artists(db: Session = Depends(database.get_read_db)):
+    """
+    Gibt alle Künstler mit der Anzahl ihrer Karten sowie dem ersten und letzten
+    Set zurück, sortiert nach Name.
+    """
+    summaries = get_artist_summaries(db)
+    return [summaries[name] for name in sorted(summaries)]
+
+
+@router.get("/{artist_name}/cards", response_model=schemas.PaginatedCardResponse)
+def get_cards_by_artist(
+    artist_name: str,
+    page: int = Query(1, ge=1, description="Die Seitenzahl."),
+    page_size: int = Query(20, ge=1, le=100, description="Anzahl der Ergebnisse pro Seite."),
+    db: Session = Depends(database.get_read_db)
+):
+    """
+    Ruft die Karten eines Künstlers anhand des exakten Namens seitenweise ab.
+    """
+    summary = get_artist_summaries(db).get(artist_name)
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"Künstler mit dem Namen '{artist_name}' nicht gefunden.")
+
+    # Die Gesamtzahl stammt aus der gecachten Übersicht, daher ist keine COUNT-Abfrage nötig
+    total_items = summary["card_count"]
+    total_pages = math.ceil(total_items / page_size)
+
+    cards = db.query(models.Card).filter(models.Card.artist_id == summary["id"]).options(
+        selectinload(models.Card.set),
+        selectinload(models.Card.rarity)
+    ).order_by(models.Card.id).offset((page - 1) * page_size).limit(page_size).all()
+
+    return {
+        "page": page,
+        "page_size": page_size,
+        "total_items": total_items,
+        "total_pages": total_pages,
+        "items": cards
+    }
@@ -0,0 +1,30 @@
+# routers/autocomplete.py
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Literal
+
+import schemas, database, search_index, instrumentation
+
+router = APIRouter(
+    prefix="/autocomplete",
+    tags=["Autocomplete"],
+    route_class=instrumentation.TimedRoute
+)
+
+
+@router.get("", response_model=List[schemas.Suggestion])
+def autocomplete(
+    q: str = Query(..., min_length=1, description="Der bisher eingegebene Text (Groß-/Kleinschreibung und Akzente irrelevant)."),
+    kind: Literal["card", "attack", "set", "artist"] = Query("card", description="Worin gesucht wird: Karten-, Attacken-, Set- oder Künstlernamen."),
+    limit: int = Query(10, ge=1, le=search_index.MAX_LIMIT, description="Maximale Anzahl an Vorschlägen."),
+    db: Session = Depends(database.get_read_db)
+):
+    """
+    Liefert Namensvorschläge für ein Suchfeld, deren Name oder ein Wort im Namen
+    mit dem eingegebenen Text beginnt. Treffer am Namensanfang stehen vorne,
+    danach wird nach der Anzahl zugehöriger Karten sortiert.
+    Die Antwort kommt aus einem In-Memory-Index, der pro Katalog-Version
+    einmal aus der Datenbank aufgebaut wird.
+    """
+    suggestions = search_index.search(db, kind, q, limit)
+    return [{"name": name, "count": count} for name, count in suggestions]
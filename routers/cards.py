@@ -1,41 +1,74 @@
 # routers/cards.py
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, select
 from sqlalchemy.orm import Session, selectinload
-# 'aliased' wird benötigt, um Mehrdeutigkeiten bei Joins zu vermeiden
-from sqlalchemy.orm import aliased
-from typing import List, Optional
+from typing import List, Literal, Optional
+from collections import defaultdict, deque
 import math
 
-import models, schemas, database
+import models, schemas, database, catalog, instrumentation
 
 # Erstelle einen "Router", um alle kartenbezogenen Endpunkte zu bündeln
 router = APIRouter(
     prefix="/cards",
-    tags=["Cards"]
+    tags=["Cards"],
+    route_class=instrumentation.TimedRoute
 )
 
 
+# --- Sortierung ---
+# Jede Sortierung entspricht einem zusammengesetzten Index auf cards (siehe models.Card),
+# die ID dient jeweils als eindeutiger Tiebreaker für stabile Seiten.
+SORT_COLUMNS = {
+    "id": (models.Card.id,),
+    "name": (models.Card.name, models.Card.id),
+    "hp": (models.Card.hp, models.Card.id),
+    "release": (models.Card.set_release_date, models.Card.collector_number, models.Card.id),
+    "rarity": (models.Card.rarity_rank, models.Card.id),
+}
+SORT_OPTIONS = tuple(SORT_COLUMNS) + tuple(f"-{key}" for key in SORT_COLUMNS)
+
+def _sort_columns(sort: str):
+    # Karten ohne Wert (z.B. Trainer ohne HP) stehen in beiden Richtungen am Ende.
+    # Die absteigenden Sortierungen haben dafür eigene Indizes (DESC NULLS LAST).
+    descending = sort.startswith("-")
+    columns = []
+    for column in SORT_COLUMNS[sort.lstrip("-")]:
+        ordered = column.desc() if descending else column.asc()
+        columns.append(ordered.nulls_last() if column.expression.nullable else ordered)
+    return columns
+
+
 @router.get("/", response_model=schemas.PaginatedCardResponse)
 def search_cards(
     # --- NEUER FILTERPARAMETER HINZUGEFÜGT ---
     attack_name: Optional[str] = Query(None, description="Filtert Karten, die eine Attacke mit diesem Namen haben (Groß-/Kleinschreibung irrelevant)."),
+    attack_cost_gte: Optional[int] = Query(None, ge=0, description="Filtert Karten mit einer Attacke, die mindestens so viele Energien kostet."),
+    attack_cost_lte: Optional[int] = Query(None, ge=0, description="Filtert Karten mit einer Attacke, die höchstens so viele Energien kostet."),
+    attack_energy: Optional[str] = Query(None, description="Filtert Karten mit einer Attacke, die diesen Energietyp benötigt (z.B. 'Feuer')."),
+    attack_damage_gte: Optional[int] = Query(None, ge=0, description="Filtert Karten mit einer Attacke, die mindestens so viel Schaden macht."),
 
     # Bestehende Filterparameter
     number_in_set: Optional[str] = Query(None, description="Filtert Karten nach der exakten Nummer im Set (z.B. '1/132')."),
     name: Optional[str] = Query(None, description="Filtert Karten, deren Name den Text enthält (Groß-/Kleinschreibung irrelevant)."),
-    supertype: Optional[str] = Query(None, description="Filtert nach exaktem Supertype ('Pokémon', 'Trainer', 'Energy')."),
-    type: Optional[str] = Query(None, description="Filtert Pokémon nach einem exakten Typ (z.B. 'Feuer')."),
-    subtype: Optional[str] = Query(None, description="Filtert Karten nach einem exakten Subtyp (z.B. 'Basis', 'Phase-1')."),
-    rarity: Optional[str] = Query(None, description="Filtert Karten nach exaktem Seltenheits-Namen."),
-    set_name: Optional[str] = Query(None, description="Filtert Karten nach exaktem Set-Namen."),
+    # Diese Filter dürfen mehrfach angegeben werden (z.B. ?type=Feuer&type=Wasser) und werden dann ODER-verknüpft
+    supertype: Optional[List[str]] = Query(None, description="Filtert nach exaktem Supertype ('Pokémon', 'Trainer', 'Energy'). Mehrfach angebbar."),
+    type: Optional[List[str]] = Query(None, description="Filtert Pokémon nach einem exakten Typ (z.B. 'Feuer'). Mehrfach angebbar."),
+    subtype: Optional[List[str]] = Query(None, description="Filtert Karten nach einem exakten Subtyp (z.B. 'Basis', 'Phase-1'). Mehrfach angebbar."),
+    rarity: Optional[List[str]] = Query(None, description="Filtert Karten nach exaktem Seltenheits-Namen. Mehrfach angebbar."),
+    set_name: Optional[List[str]] = Query(None, description="Filtert Karten nach exaktem Set-Namen. Mehrfach angebbar."),
+    artist: Optional[List[str]] = Query(None, description="Filtert Karten nach exaktem Künstler-Namen. Mehrfach angebbar."),
     hp_gte: Optional[int] = Query(None, description="Filtert Pokémon, deren HP größer oder gleich diesem Wert sind."),
     hp_lt: Optional[int] = Query(None, description="Filtert Pokémon, deren HP kleiner als dieser Wert sind."),
 
+    # Sortierung
+    sort: Literal[SORT_OPTIONS] = Query("id", description="Sortierung: 'name', 'hp', 'release' (Set-Erscheinungsdatum, dann Sammlernummer), 'rarity' (von häufig nach selten) oder 'id'. Ein vorangestelltes '-' sortiert absteigend."),
+
     # Paginierungsparameter
     page: int = Query(1, ge=1, description="Die Seitenzahl."),
     page_size: int = Query(20, ge=1, le=100, description="Anzahl der Ergebnisse pro Seite."),
 
-    db: Session = Depends(database.get_db)
+    db: Session = Depends(database.get_read_db)
 ):
     """
     Sucht und listet Karten mit erweiterten Filtern und Paginierung auf.
@@ -43,12 +76,22 @@ def search_cards(
     """
     query = db.query(models.Card)
 
-    # --- NEUE FILTERLOGIK IMPLEMENTIERT ---
+    # --- Attacken-Filter ---
+    # Alle Attacken-Bedingungen müssen von *derselben* Attacke erfüllt werden.
+    # .any() erzeugt ein EXISTS, daher entstehen keine doppelten Karten durch einen Join.
+    attack_conditions = []
     if attack_name:
-        # Führe einen Join zur Attack-Tabelle durch
-        # Verwende .any(), um zu prüfen, ob *mindestens eine* Attacke den Kriterien entspricht
-        query = query.join(models.Attack).filter(
-            models.Attack.name.ilike(f"%{attack_name}%"))
+        attack_conditions.append(models.Attack.name.ilike(f"%{attack_name}%"))
+    if attack_cost_gte is not None:
+        attack_conditions.append(models.Attack.converted_cost >= attack_cost_gte)
+    if attack_cost_lte is not None:
+        attack_conditions.append(models.Attack.converted_cost <= attack_cost_lte)
+    if attack_energy:
+        attack_conditions.append(models.Attack.cost_entries.any(models.AttackCost.energy_type == attack_energy))
+    if attack_damage_gte is not None:
+        attack_conditions.append(models.Attack.damage_value >= attack_damage_gte)
+    if attack_conditions:
+        query = query.filter(models.Card.attacks.any(and_(*attack_conditions)))
 
     # Bestehende Filterlogik
     if number_in_set:
@@ -58,24 +101,27 @@ def search_cards(
         query = query.filter(models.Card.name.ilike(f"%{name}%"))
 
     if supertype:
-        query = query.filter(models.Card.supertype == supertype)
+        query = query.filter(models.Card.supertype.in_(supertype))
 
+    # Typen und Subtypen über EXISTS statt Join prüfen, damit keine doppelten Karten entstehen
     if type:
-        # Erstelle einen Alias für die Type-Tabelle, um Konflikte zu vermeiden, falls später mehr Joins hinzukommen
-        type_alias = aliased(models.Type)
-        query = query.join(models.Card.types.of_type(type_alias)).filter(
-            type_alias.name == type)
+        query = query.filter(models.Card.types.any(models.Type.name.in_(type)))
 
     if subtype:
-        subtype_alias = aliased(models.Subtype)
-        query = query.join(models.Card.subtypes.of_type(subtype_alias)).filter(
-            subtype_alias.name == subtype)
+        query = query.filter(models.Card.subtypes.any(models.Subtype.name.in_(subtype)))
 
+    # Lookup-Namen werden in einer Unterabfrage zu IDs aufgelöst, damit die Indizes auf cards greifen
     if rarity:
-        query = query.join(models.Rarity).filter(models.Rarity.name == rarity)
+        query = query.filter(models.Card.rarity_id.in_(
+            select(models.Rarity.id).where(models.Rarity.name.in_(rarity))))
 
     if set_name:
-        query = query.join(models.Set).filter(models.Set.name == set_name)
+        query = query.filter(models.Card.set_id.in_(
+            select(models.Set.id).where(models.Set.name.in_(set_name))))
+
+    if artist:
+        query = query.filter(models.Card.artist_id.in_(
+            select(models.Artist.id).where(models.Artist.name.in_(artist))))
 
     if hp_gte is not None:
         query = query.filter(models.Card.hp >= hp_gte)
@@ -84,14 +130,14 @@ def search_cards(
         query = query.filter(models.Card.hp < hp_lt)
 
     # --- Paginierungslogik ---
-    # Zähle die *eindeutigen* Karten, um Duplikate durch Joins zu vermeiden
-    total_items = query.distinct().count()
+    # Alle Filter sind EXISTS/IN-Bedingungen ohne Join, daher ist jede Karte nur einmal enthalten
+    total_items = query.count()
     total_pages = math.ceil(total_items / page_size)
 
     cards = query.options(
         selectinload(models.Card.set),
         selectinload(models.Card.rarity)
-    ).distinct().offset((page - 1) * page_size).limit(page_size).all()
+    ).order_by(*_sort_columns(sort)).offset((page - 1) * page_size).limit(page_size).all()
 
     return {
         "page": page,
@@ -102,13 +148,96 @@ def search_cards(
     }
 
 
-@router.get("/{tcg_id}", response_model=schemas.CardDetailResponse)
-def get_card_by_id(tcg_id: str, db: Session = Depends(database.get_db)):
+# --- Entwicklungsreihen ---
+
+def _load_evolution_graph(db: Session):
+    """Lädt alle Kanten des beim Import aufgebauten Entwicklungsgraphen."""
+    parents, children = defaultdict(set), defaultdict(set)
+    for name, evolves_from in db.query(models.Evolution.name, models.Evolution.evolves_from):
+        parents[name].add(evolves_from)
+        children[evolves_from].add(name)
+    return {"parents": dict(parents), "children": dict(children)}
+
+def get_evolution_graph(db: Session):
+    """Gibt den namensbasierten Entwicklungsgraphen zurück (pro Katalog-Version gecacht)."""
+    return catalog.cached(db, "evolution_graph", _load_evolution_graph)
+
+def find_evolution_family(graph, name: str):
     """
-    Ruft alle Details für eine einzelne Karte anhand ihrer TCG-ID (z.B. "me01-1") ab.
+    Ermittelt alle Vorentwicklungen von `name` und ausgehend von deren
+    Basis-Stufen alle Entwicklungen. Gibt ein Dict Name -> Stufe zurück.
     """
+    parents, children = graph["parents"], graph["children"]
+
+    # Nach oben bis zu den Basis-Stufen laufen
+    roots, seen, stack = set(), {name}, [name]
+    while stack:
+        current = stack.pop()
+        current_parents = parents.get(current, ())
+        if not current_parents:
+            roots.add(current)
+        for parent in current_parents:
+            if parent not in seen:
+                seen.add(parent)
+                stack.append(parent)
+    if not roots:
+        # Nur bei fehlerhaften, zyklischen Daten möglich
+        roots = {name}
+
+    # Von den Basis-Stufen aus alle Entwicklungen einsammeln
+    stages = {root: 0 for root in roots}
+    queue = deque(sorted(roots))
+    while queue:
+        current = queue.popleft()
+        for child in sorted(children.get(current, ())):
+            if child not in stages:
+                stages[child] = stages[current] + 1
+                queue.append(child)
+    return stages
+
+
+@router.get("/{tcg_id}/evolutions", response_model=schemas.EvolutionChainResponse)
+def get_evolution_chain(tcg_id: str, db: Session = Depends(database.get_read_db)):
+    """
+    Gibt die vollständige Entwicklungsreihe einer Karte zurück: alle
+    Vorentwicklungen und alle Entwicklungen, jeweils mit den passenden Karten
+    gruppiert nach Namen. Die Reihe wird aus dem vorberechneten
+    Entwicklungsgraphen bestimmt, die Karten mit einer einzigen Abfrage geladen.
+    """
+    card_name = db.query(models.Card.name).filter(models.Card.tcg_id == tcg_id).scalar()
+    if card_name is None:
+        raise HTTPException(status_code=404, detail="Karte nicht gefunden")
+
+    graph = get_evolution_graph(db)
+    family = find_evolution_family(graph, card_name)
+
+    cards = db.query(models.Card).options(
+        selectinload(models.Card.set),
+        selectinload(models.Card.rarity)
+    ).filter(models.Card.name.in_(list(family))).order_by(models.Card.id).all()
+
+    cards_by_name = defaultdict(list)
+    for card in cards:
+        cards_by_name[card.name].append(card)
+
+    stages = [
+        {
+            "name": name,
+            "stage": stage,
+            "evolves_from": sorted(graph["parents"].get(name, ())),
+            "cards": cards_by_name[name]
+        }
+        for name, stage in sorted(family.items(), key=lambda item: (item[1], item[0]))
+    ]
+
+    return {"tcg_id": tcg_id, "name": card_name, "stages": stages}
+
+
+# --- Kartendetails ---
+
+def _card_detail_query(db: Session):
     # Lade alle Beziehungen direkt mit, da wir hier die Detailansicht wollen
-    card = db.query(models.Card).options(
+    return db.query(models.Card).options(
         selectinload(models.Card.set),
         selectinload(models.Card.rarity),
         selectinload(models.Card.artist),
@@ -117,9 +246,35 @@ def get_card_by_id(tcg_id: str, db: Session = Depends(database.get_db)):
         selectinload(models.Card.attacks),
         selectinload(models.Card.abilities),
         selectinload(models.Card.rules)
-    ).filter(models.Card.tcg_id == tcg_id).first()
+    )
+
+def _serialize_card_detail(card: models.Card):
+    # Gecacht werden reine Daten, keine an die Session gebundenen ORM-Objekte
+    return schemas.CardDetailResponse.model_validate(card).model_dump()
+
+def _load_card_detail(db: Session, tcg_id: str):
+    card = _card_detail_query(db).filter(models.Card.tcg_id == tcg_id).first()
+    return None if card is None else _serialize_card_detail(card)
+
+def get_card_detail(db: Session, tcg_id: str):
+    """Gibt die Detailansicht einer Karte zurück (pro Katalog-Version gecacht, begrenzte Größe)."""
+    return catalog.cached_item(db, "card_detail", tcg_id, _load_card_detail)
+
+def preload_card_details(db: Session, tcg_ids):
+    """Lädt die Detailansichten mehrerer Karten gebündelt in den Cache."""
+    cards = _card_detail_query(db).filter(models.Card.tcg_id.in_(tcg_ids)).all() if tcg_ids else []
+    catalog.prime_items(db, "card_detail", {card.tcg_id: _serialize_card_detail(card) for card in cards})
+    return len(cards)
+
+
+@router.get("/{tcg_id}", response_model=schemas.CardDetailResponse)
+def get_card_by_id(tcg_id: str, db: Session = Depends(database.get_read_db)):
+    """
+    Ruft alle Details für eine einzelne Karte anhand ihrer TCG-ID (z.B. "me01-1") ab.
+    """
+    card = get_card_detail(db, tcg_id)
 
     if card is None:
         raise HTTPException(status_code=404, detail="Karte nicht gefunden")
 
-    return card
\ No newline at end of file
+    return card
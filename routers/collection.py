@@ -1,15 +1,16 @@
 # routers/collection.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List
 
-import models, schemas, database
+import models, schemas, database, instrumentation
 from .auth_utils import get_current_active_user
 
 router = APIRouter(
     prefix="/collection",
     tags=["Collection"],
-    dependencies=[Depends(get_current_active_user)]
+    dependencies=[Depends(get_current_active_user)],
+    route_class=instrumentation.TimedRoute
 )
 
 @router.get("/cards", response_model=List[schemas.CollectionItemResponse])
@@ -20,7 +21,11 @@ def get_user_collection(
     """
     Gibt die Sammlung des Benutzers zurück, inklusive der Anzahl jeder Karte.
     """
-    collection_items = db.query(models.UserCollection).filter(
+    # Karten samt Set und Seltenheit vorladen, statt sie pro Eintrag einzeln nachzuladen
+    collection_items = db.query(models.UserCollection).options(
+        selectinload(models.UserCollection.card).selectinload(models.Card.set),
+        selectinload(models.UserCollection.card).selectinload(models.Card.rarity)
+    ).filter(
         models.UserCollection.user_id == current_user.id
     ).all()
     
@@ -50,17 +55,21 @@ def add_or_increment_card_in_collection(
         models.UserCollection.card_id == card_to_add.id
     ).first()
 
+    # Werte vor dem Commit lesen, da die Objekte danach verfallen und neu geladen würden
+    card_name = card_to_add.name
+
     # --- FIX for Error 2 ---
     if existing_entry is not None:
         # --- FIX for Error 1 ---
-        existing_entry.quantity = existing_entry.quantity + 1
+        new_quantity = existing_entry.quantity + 1
+        existing_entry.quantity = new_quantity
         db.commit()
-        return {"detail": f"Anzahl für '{card_to_add.name}' auf {existing_entry.quantity} erhöht."}
+        return {"detail": f"Anzahl für '{card_name}' auf {new_quantity} erhöht."}
     else:
         new_entry = models.UserCollection(user_id=current_user.id, card_id=card_to_add.id, quantity=1)
         db.add(new_entry)
         db.commit()
-        return {"detail": f"Karte '{card_to_add.name}' zur Sammlung hinzugefügt."}
+        return {"detail": f"Karte '{card_name}' zur Sammlung hinzugefügt."}
 
 @router.delete("/cards/{tcg_id}", response_model=schemas.Message)
 def remove_or_decrement_card_in_collection(
@@ -85,12 +94,16 @@ def remove_or_decrement_card_in_collection(
     if entry is None:
         raise HTTPException(status_code=404, detail="Karte nicht in der Sammlung gefunden")
 
+    # Werte vor dem Commit lesen, da die Objekte danach verfallen und neu geladen würden
+    card_name = card_to_remove.name
+
     if entry.quantity > 1:
         # --- FIX for Error 3 ---
-        entry.quantity = entry.quantity - 1
+        new_quantity = entry.quantity - 1
+        entry.quantity = new_quantity
         db.commit()
-        return {"detail": f"Anzahl für '{card_to_remove.name}' auf {entry.quantity} reduziert."}
+        return {"detail": f"Anzahl für '{card_name}' auf {new_quantity} reduziert."}
     else:
         db.delete(entry)
         db.commit()
-        return {"detail": f"Karte '{card_to_remove.name}' aus der Sammlung entfernt."}
\ No newline at end of file
+        return {"detail": f"Karte '{card_name}' aus der Sammlung entfernt."}
\ No newline at end of file
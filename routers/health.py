@@ -0,0 +1,31 @@
+# routers/health.py
+from fastapi import APIRouter, HTTPException
+
+import schemas, warmup, instrumentation
+
+router = APIRouter(
+    prefix="/health",
+    tags=["Monitoring"],
+    route_class=instrumentation.TimedRoute
+)
+
+
+@router.get("/live", response_model=schemas.HealthStatus)
+def liveness():
+    """
+    Meldet, dass der Prozess läuft. Greift nicht auf die Datenbank zu.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/ready", response_model=schemas.HealthStatus)
+def readiness():
+    """
+    Meldet Bereitschaft erst, wenn die Aufwärmphase abgeschlossen ist
+    (Präfixindex, Übersichten, Hilfslisten und häufige Kartendetails im Cache).
+    Bis dahin antwortet der Endpunkt mit 503, damit der Worker noch keinen
+    Verkehr erhält.
+    """
+    if not warmup.is_ready():
+        raise HTTPException(status_code=503, detail="Die Caches werden noch aufgewärmt.")
+    return {"status": "ready"}
@@ -1,36 +1,89 @@
 # routers/lists.py
 from fastapi import APIRouter, Depends
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List
+from datetime import date
 
-import models, schemas, database
+import models, schemas, database, catalog, instrumentation
 
 # Erstelle einen neuen Router für diese Endpunkt-Gruppe
 router = APIRouter(
-    tags=["Helper Lists"] # Gruppiert diese Endpunkte in der Doku
+    tags=["Helper Lists"], # Gruppiert diese Endpunkte in der Doku
+    route_class=instrumentation.TimedRoute
 )
 
-@router.get("/sets", response_model=List[schemas.Set]) 
-def get_all_sets(db: Session = Depends(database.get_db)):
+def _load_set_overview(db: Session):
     """
-    Gibt eine Liste aller existierenden Set-Namen zurück, sortiert nach Name.
-    Nützlich für Filter-Dropdowns.
+    Lädt alle Sets mit Kartenanzahl pro Seltenheit in einer einzigen,
+    nach Set und Seltenheit gruppierten Abfrage.
     """
-    sets = db.query(models.Set).order_by(models.Set.name).all()
-    return sets
+    rows = db.query(
+        models.Set.id,
+        models.Set.name,
+        models.Set.symbol_url,
+        models.Set.release_date,
+        models.Rarity.name,
+        func.count(models.Card.id)
+    ).outerjoin(models.Card, models.Card.set_id == models.Set.id).outerjoin(
+        models.Rarity, models.Card.rarity_id == models.Rarity.id
+    ).group_by(
+        models.Set.id, models.Set.name, models.Set.symbol_url, models.Set.release_date, models.Rarity.name
+    ).all()
+
+    overview = {}
+    for set_id, name, symbol_url, release_date, rarity_name, card_count in rows:
+        entry = overview.setdefault(set_id, {
+            "id": set_id,
+            "name": name,
+            "symbol_url": symbol_url,
+            "release_date": release_date,
+            "card_count": 0,
+            "rarity_counts": {}
+        })
+        entry["card_count"] += card_count
+        if rarity_name is not None:
+            entry["rarity_counts"][rarity_name] = card_count
+
+    # Nach Erscheinungsdatum sortieren, Sets ohne Datum zuletzt
+    return sorted(overview.values(), key=lambda entry: (entry["release_date"] is None, entry["release_date"] or date.min, entry["name"]))
+
+def get_set_overview(db: Session):
+    """Gibt die Set-Übersicht zurück (pro Katalog-Version gecacht)."""
+    return catalog.cached(db, "set_overview", _load_set_overview)
+
+@router.get("/sets", response_model=List[schemas.SetOverview])
+def get_all_sets(db: Session = Depends(database.get_read_db)):
+    """
+    Gibt alle Sets mit der Anzahl ihrer Karten (insgesamt und pro Seltenheit)
+    zurück, sortiert nach Erscheinungsdatum. Nützlich für Filter-Dropdowns.
+    """
+    return get_set_overview(db)
+
+def _load_rarity_names(db: Session):
+    return [{"name": name} for name, in db.query(models.Rarity.name).order_by(models.Rarity.name)]
+
+def get_rarity_names(db: Session):
+    """Gibt alle Seltenheiten sortiert nach Name zurück (pro Katalog-Version gecacht)."""
+    return catalog.cached(db, "rarity_names", _load_rarity_names)
+
+def _load_type_names(db: Session):
+    return [{"name": name} for name, in db.query(models.Type.name).order_by(models.Type.name)]
+
+def get_type_names(db: Session):
+    """Gibt alle Pokémon-Typen sortiert nach Name zurück (pro Katalog-Version gecacht)."""
+    return catalog.cached(db, "type_names", _load_type_names)
 
 @router.get("/rarities/", response_model=List[schemas.RarityNameResponse])
-def get_all_rarities(db: Session = Depends(database.get_db)):
+def get_all_rarities(db: Session = Depends(database.get_read_db)):
     """
     Gibt eine Liste aller einzigartigen Seltenheiten zurück, sortiert nach Name.
     """
-    rarities = db.query(models.Rarity).order_by(models.Rarity.name).all()
-    return rarities
+    return get_rarity_names(db)
 
 @router.get("/types/", response_model=List[schemas.TypeNameResponse])
-def get_all_types(db: Session = Depends(database.get_db)):
+def get_all_types(db: Session = Depends(database.get_read_db)):
     """
     Gibt eine Liste aller Pokémon-Typen zurück, sortiert nach Name.
     """
-    types = db.query(models.Type).order_by(models.Type.name).all()
-    return types
\ No newline at end of file
+    return get_type_names(db)
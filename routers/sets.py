@@ -1,29 +1,88 @@
 # routers/sets.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, selectinload
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, tuple_, union_all
+from sqlalchemy.orm import Session, aliased, selectinload
+from typing import Optional
 
-import models, schemas, database
+import models, schemas, database, instrumentation
+from .lists import get_set_overview
 
 router = APIRouter(
     prefix="/sets", # Alle Routen hier beginnen mit /sets
-    tags=["Sets"]
+    tags=["Sets"],
+    route_class=instrumentation.TimedRoute
 )
 
-@router.get("/{set_name}/cards", response_model=List[schemas.CardListResponse])
-def get_cards_by_set_name(set_name: str, db: Session = Depends(database.get_db)):
+
+def _encode_cursor(card: models.Card) -> str:
+    collector_number = "" if card.collector_number is None else str(card.collector_number)
+    return f"{collector_number}:{card.id}"
+
+def _decode_cursor(cursor: str):
+    try:
+        collector_number, card_id = cursor.split(":")
+        return (int(collector_number) if collector_number else None), int(card_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Ungültiger Cursor.")
+
+
+@router.get("/{set_name}/cards", response_model=schemas.SetCardsPage)
+def get_cards_by_set_name(
+    set_name: str,
+    cursor: Optional[str] = Query(None, description="Der 'next_cursor' der vorherigen Seite. Leer für die erste Seite."),
+    limit: int = Query(50, ge=1, le=200, description="Anzahl der Karten pro Seite."),
+    db: Session = Depends(database.get_read_db)
+):
     """
-    Ruft alle Karten eines spezifischen Sets anhand des exakten Set-Namens ab.
+    Ruft die Karten eines Sets anhand des exakten Set-Namens seitenweise ab,
+    sortiert nach der numerischen Sammlernummer. Für die nächste Seite wird
+    der zurückgegebene `next_cursor` übergeben; er ist leer, wenn keine
+    weiteren Karten folgen.
     """
-    # Finde zuerst das Set, um sicherzustellen, dass es existiert.
-    target_set = db.query(models.Set).filter(models.Set.name == set_name).first()
-    if not target_set:
+    # Das Set wird in der gecachten Übersicht nachgeschlagen, nicht per Abfrage
+    target_set = next((entry for entry in get_set_overview(db) if entry["name"] == set_name), None)
+    if target_set is None:
         raise HTTPException(status_code=404, detail=f"Set mit dem Namen '{set_name}' nicht gefunden.")
 
-    # Hole alle Karten, die zu diesem Set gehören.
-    cards = db.query(models.Card).filter(models.Card.set_id == target_set.id).options(
-        selectinload(models.Card.set),
-        selectinload(models.Card.rarity)
-    ).order_by(models.Card.id).all() # Sortierung nach ID für konsistente Ergebnisse
+    # Keyset-Paginierung entlang des Index (set_id, collector_number, id) in zwei Phasen:
+    # erst die nummerierten Karten, danach die Karten ohne Nummer. Der Cursor enthält die
+    # Phase (leere Nummer = Karten ohne Nummer), sodass jede Phase ein reiner Bereichszugriff
+    # auf den Index ist statt einer ODER-Bedingung über die ganze Liste.
+    last_number, last_id = _decode_cursor(cursor) if cursor else (None, None)
+    in_numbered_phase = not cursor or last_number is not None
+
+    # Eine Karte mehr laden, um zu erkennen, ob es eine weitere Seite gibt
+    phases = []
+    if in_numbered_phase:
+        numbered = select(models.Card).where(
+            models.Card.set_id == target_set["id"], models.Card.collector_number.isnot(None)
+        )
+        if cursor:
+            numbered = numbered.where(tuple_(models.Card.collector_number, models.Card.id) > tuple_(last_number, last_id))
+        phases.append(numbered.order_by(models.Card.collector_number, models.Card.id).limit(limit + 1).subquery())
+    unnumbered = select(models.Card).where(
+        models.Card.set_id == target_set["id"], models.Card.collector_number.is_(None)
+    )
+    if last_id is not None and not in_numbered_phase:
+        unnumbered = unnumbered.where(models.Card.id > last_id)
+    phases.append(unnumbered.order_by(models.Card.id).limit(limit + 1).subquery())
+
+    page = union_all(*(select(phase) for phase in phases)).subquery()
+    page_card = aliased(models.Card, page)
+    cards = db.query(page_card).options(
+        selectinload(page_card.set),
+        selectinload(page_card.rarity)
+    ).order_by(
+        page.c.collector_number.asc().nulls_last(), page.c.id
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(cards) > limit:
+        cards = cards[:limit]
+        next_cursor = _encode_cursor(cards[-1])
 
-    return cards
\ No newline at end of file
+    return {
+        "total_items": target_set["card_count"],
+        "next_cursor": next_cursor,
+        "items": cards
+    }
@@ -5,11 +5,12 @@ from sqlalchemy.orm import Session
 from typing import List
 from datetime import timedelta
 
-import models, schemas, database
+import models, schemas, database, instrumentation
 from .auth_utils import create_access_token, get_password_hash, verify_password
 
 router = APIRouter(
-    tags=["Users & Authentication"]
+    tags=["Users & Authentication"],
+    route_class=instrumentation.TimedRoute
 )
 
 # --- Konstanten für die Token-Gültigkeit ---
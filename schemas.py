@@ -1,6 +1,6 @@
 # schemas.py
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import date
 
 # --- Basis-Modelle (für verschachtelte Objekte) ---
@@ -30,7 +30,9 @@ class Subtype(BaseModel):
 class Attack(BaseModel):
     name: Optional[str] = None
     cost: Optional[str] = None
+    converted_cost: Optional[int] = None
     damage: Optional[str] = None
+    damage_value: Optional[int] = None
     text: Optional[str] = None
     class Config: from_attributes = True
 
@@ -88,6 +90,46 @@ class PaginatedCardResponse(BaseModel):
     items: List[CardListResponse]
 
 
+class EvolutionStage(BaseModel):
+    """Eine Stufe der Entwicklungsreihe mit allen Karten dieses Namens."""
+    name: str
+    stage: int
+    evolves_from: List[str] = []
+    cards: List[CardListResponse] = []
+
+class EvolutionChainResponse(BaseModel):
+    """Die vollständige Entwicklungsreihe zu einer Karte."""
+    tcg_id: str
+    name: str
+    stages: List[EvolutionStage]
+
+
+class ArtistSummary(BaseModel):
+    """Ein Künstler mit der Anzahl seiner Karten und dem ersten/letzten Set."""
+    name: str
+    card_count: int
+    first_set: Optional[str] = None
+    last_set: Optional[str] = None
+
+
+class Suggestion(BaseModel):
+    """Ein Vorschlag der Autovervollständigung mit der Anzahl zugehöriger Karten."""
+    name: str
+    count: int
+
+
+class SetOverview(Set):
+    """Ein Set mit der Anzahl seiner Karten, insgesamt und pro Seltenheit."""
+    card_count: int
+    rarity_counts: Dict[str, int] = {}
+
+class SetCardsPage(BaseModel):
+    """Eine Seite der Karten eines Sets, sortiert nach Sammlernummer."""
+    total_items: int
+    next_cursor: Optional[str] = None
+    items: List[CardListResponse]
+
+
 # --- Modelle für Benutzer & Authentifizierung (für die Zukunft) ---
 
 class UserBase(BaseModel):
@@ -124,6 +166,9 @@ class TypeNameResponse(BaseModel):
 class Message(BaseModel):
     detail: str
 
+class HealthStatus(BaseModel):
+    status: str
+
 # --- NEUES MODELL FÜR SAMMLUNGS-ANTWORTEN ---
 class CollectionItemResponse(BaseModel):
     quantity: int
@@ -0,0 +1,124 @@
+# search_index.py
+"""
+In-Memory-Präfixindex für die Autovervollständigung.
+
+Pro Art (Kartennamen, Attacken, Sets, Künstler) wird ein sortiertes Array
+normalisierter Schlüssel (klein geschrieben, ohne Akzente) aufgebaut und pro
+Katalog-Version gecacht; nach einem Import wird es also neu aufgebaut.
+Neben dem vollständigen Namen wird auch jeder Wortanfang indiziert, sodass
+"chari" sowohl "Charizard" als auch "Dark Charizard" findet. Die Suche ist
+eine binäre Suche ohne Datenbankzugriff; für sehr kurze Präfixe sind die
+Top-Ergebnisse vorberechnet.
+"""
+import bisect
+import heapq
+import logging
+import unicodedata
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+import models, catalog
+
+logger = logging.getLogger("pokenizer.search_index")
+
+# Maximale Anzahl an Vorschlägen pro Anfrage
+MAX_LIMIT = 20
+# Bis zu dieser Präfixlänge werden die Top-Ergebnisse beim Aufbau vorberechnet
+PRECOMPUTED_PREFIX_LENGTH = 2
+
+
+def normalize(text: str) -> str:
+    """Kleinschreibung, Akzente entfernen (é -> e) und Leerraum vereinheitlichen."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+    return " ".join(folded.split())
+
+
+class PrefixIndex:
+    """Sortiertes Array aus (Schlüssel, Eintrag) mit Gewichtung pro Eintrag."""
+
+    def __init__(self, weighted_names):
+        self.names, self.weights = [], []
+        postings = []
+        for name, weight in weighted_names:
+            if not name:
+                continue
+            entry = len(self.names)
+            self.names.append(name)
+            self.weights.append(weight)
+            key = normalize(name)
+            postings.append((key, entry, True))
+            # Jeder weitere Wortanfang (nach Leerzeichen, Bindestrich usw.) ist ebenfalls ein Einstiegspunkt
+            for position in range(1, len(key)):
+                if key[position].isalnum() and not key[position - 1].isalnum():
+                    postings.append((key[position:], entry, False))
+        postings.sort()
+        self._keys = [posting[0] for posting in postings]
+        self._entries = [posting[1] for posting in postings]
+        self._full_match = [posting[2] for posting in postings]
+
+        self._precomputed = {}
+        prefixes = {key[:length] for key in self._keys for length in range(1, PRECOMPUTED_PREFIX_LENGTH + 1)}
+        for prefix in prefixes:
+            self._precomputed[prefix] = self._rank(prefix, MAX_LIMIT)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _rank(self, prefix: str, limit: int):
+        low = bisect.bisect_left(self._keys, prefix)
+        high = bisect.bisect_left(self._keys, prefix + "\U0010ffff", low)
+        best = {}
+        for position in range(low, high):
+            entry = self._entries[position]
+            full_match = self._full_match[position]
+            if best.get(entry) is not True:
+                best[entry] = full_match
+        # Treffer am Namensanfang vor Treffern an Wortanfängen, dann nach Gewicht
+        ranked = heapq.nsmallest(
+            limit, best.items(),
+            key=lambda item: (not item[1], -self.weights[item[0]], self.names[item[0]])
+        )
+        return [(self.names[entry], self.weights[entry]) for entry, _ in ranked]
+
+    def search(self, text: str, limit: int = 10):
+        """Gibt bis zu `limit` (Name, Gewicht)-Paare zurück, deren Name oder Wortanfang mit `text` beginnt."""
+        prefix = normalize(text)
+        if not prefix:
+            return []
+        limit = min(limit, MAX_LIMIT)
+        precomputed = self._precomputed.get(prefix)
+        if precomputed is not None:
+            return precomputed[:limit]
+        if len(prefix) <= PRECOMPUTED_PREFIX_LENGTH:
+            return []
+        return self._rank(prefix, limit)
+
+
+def _load_weighted_names(db: Session):
+    """Lädt die Namen pro Art mit der Anzahl zugehöriger Karten als Gewicht."""
+    return {
+        "card": db.query(models.Card.name, func.count(models.Card.id)).group_by(models.Card.name).all(),
+        "attack": db.query(models.Attack.name, func.count(models.Attack.id)).group_by(models.Attack.name).all(),
+        "set": db.query(models.Set.name, func.count(models.Card.id)).outerjoin(
+            models.Card, models.Card.set_id == models.Set.id).group_by(models.Set.name).all(),
+        "artist": db.query(models.Artist.name, func.count(models.Card.id)).outerjoin(
+            models.Card, models.Card.artist_id == models.Artist.id).group_by(models.Artist.name).all()
+    }
+
+
+def _build_indexes(db: Session):
+    indexes = {kind: PrefixIndex(rows) for kind, rows in _load_weighted_names(db).items()}
+    logger.info("Präfixindex aufgebaut: %s", ", ".join(f"{kind}={len(index)}" for kind, index in indexes.items()))
+    return indexes
+
+
+def get_indexes(db: Session):
+    """Gibt die Präfixindizes pro Art zurück (pro Katalog-Version gecacht)."""
+    return catalog.cached(db, "prefix_indexes", _build_indexes)
+
+
+def search(db: Session, kind: str, text: str, limit: int = 10):
+    """Sucht im Index der angegebenen Art und gibt bis zu `limit` (Name, Gewicht)-Paare zurück."""
+    return get_indexes(db)[kind].search(text, limit)
@@ -0,0 +1,100 @@
+# warmup.py
+"""
+Aufwärmphase eines Worker-Prozesses.
+
+Nach dem Start lädt ein Hintergrund-Thread alles, was sonst die ersten
+Anfragen ausbremsen würde: den Präfixindex der Autovervollständigung, die
+Set-Übersicht, die Künstler-Übersicht, den Entwicklungsgraphen, die
+Hilfslisten (Seltenheiten, Typen) sowie die Detailansichten der meistgesammelten
+Karten. Erst danach meldet `/health/ready` Bereitschaft, sodass ein
+Load-Balancer den Worker nicht mit kalten Caches bedient.
+
+Schlägt das Aufwärmen fehl (z.B. weil die Datenbank noch nicht erreichbar
+ist), wird es nach WARMUP_RETRY_SECONDS erneut versucht.
+"""
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+import models, database, search_index
+from routers import artists, cards, lists
+
+logger = logging.getLogger("pokenizer.warmup")
+
+# Anzahl der meistgesammelten Karten, deren Detailansicht vorgeladen wird
+WARMUP_HOT_CARDS = int(os.getenv("WARMUP_HOT_CARDS", "500"))
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "5"))
+
+_ready = threading.Event()
+_stop = threading.Event()
+_thread = None
+
+
+def _hot_card_ids(db: Session, limit: int):
+    """Die TCG-IDs der Karten, die in den meisten Sammlungen vorkommen."""
+    if limit <= 0:
+        return []
+    rows = db.query(models.Card.tcg_id).join(
+        models.UserCollection, models.UserCollection.card_id == models.Card.id
+    ).group_by(models.Card.id, models.Card.tcg_id).order_by(
+        func.count(models.UserCollection.user_id).desc(), models.Card.id
+    ).limit(limit).all()
+    return [tcg_id for tcg_id, in rows]
+
+
+def warm_up(db: Session):
+    """Füllt alle Caches des Prozesses. Gibt die Anzahl vorgeladener Kartendetails zurück."""
+    search_index.get_indexes(db)
+    lists.get_set_overview(db)
+    lists.get_rarity_names(db)
+    lists.get_type_names(db)
+    artists.get_artist_summaries(db)
+    cards.get_evolution_graph(db)
+    return cards.preload_card_details(db, _hot_card_ids(db, WARMUP_HOT_CARDS))
+
+
+def _run():
+    while not _stop.is_set():
+        started = time.perf_counter()
+        db = database.ReadSessionLocal()
+        try:
+            card_count = warm_up(db)
+        except Exception:
+            logger.exception("Aufwärmen fehlgeschlagen, neuer Versuch in %.0f s", WARMUP_RETRY_SECONDS)
+            _stop.wait(WARMUP_RETRY_SECONDS)
+            continue
+        finally:
+            db.close()
+        _ready.set()
+        logger.info("Aufwärmen abgeschlossen in %.2f s (%d Kartendetails vorgeladen)",
+                    time.perf_counter() - started, card_count)
+        return
+
+
+def start():
+    """Startet die Aufwärmphase im Hintergrund (beim Start der Anwendung)."""
+    global _thread
+    _ready.clear()
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="warmup", daemon=True)
+    _thread.start()
+
+
+def stop():
+    """Bricht eine noch laufende Aufwärmphase beim Herunterfahren ab."""
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=WARMUP_RETRY_SECONDS)
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def wait_until_ready(timeout: float = None) -> bool:
+    """Blockiert, bis das Aufwärmen abgeschlossen ist (für die perf-Werkzeuge)."""
+    return _ready.wait(timeout)